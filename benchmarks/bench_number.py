@@ -0,0 +1,59 @@
+"""
+Mide sobre montos aleatorios (Decimal, con negativos) el tiempo de 
+MontoText(), MontoHtml() y Text.set_coin() llamados monto por monto, 
+comparado con MontoFormatter.format_many().
+
+Ej. python benchmarks/bench_number.py [size]
+"""
+
+import os
+import random
+import sys
+import time
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+
+import django
+
+django.setup()
+
+from unoletutils.libs.number import Number, get_monto_formatter
+
+
+def benchmark(size: int=1000000, seed: int=0) -> dict:
+    """Retorna {nombre: (anterior, actual)} en segundos."""
+    rnd = random.Random(seed)
+    montos = [Decimal(rnd.randint(-10 ** 7, 10 ** 9)).scaleb(-2) 
+        for _ in range(size)]
+
+    def set_coin(numero, simbolo="$"):
+        # Igual que Text.set_coin().
+        return f"{simbolo}{round(numero, 2):,}"
+
+    cases = {
+        "MontoText": (lambda v: Number.MontoText(v, "DOP"), 
+            get_monto_formatter("DOP")),
+        "MontoHtml": (lambda v: Number.MontoHtml(v, "DOP"), 
+            get_monto_formatter("DOP", html=True)),
+        "set_coin": (set_coin, 
+            get_monto_formatter(None, simbolo="$", fixed=False)),
+    }
+    out = {}
+    for (name, (previous, formatter)) in cases.items():
+        start = time.perf_counter()
+        expected = [previous(v) for v in montos]
+        elapsed = time.perf_counter() - start
+        start = time.perf_counter()
+        result = formatter.format_many(montos)
+        out[name] = (elapsed, time.perf_counter() - start)
+        if expected != result:
+            raise ValueError(f"'{name}' no produce el mismo resultado.")
+    return out
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    for (name, (previous, current)) in benchmark(size).items():
+        print(f"{name}: {previous:.3f}s -> {current:.3f}s")
@@ -0,0 +1,88 @@
+"""
+Mide sobre un corpus de textos aleatorios (con tíldes, eñes, signos y 
+espacios) el tiempo de format_codename() y get_tag()/get_tags() con 'allow', 
+comparado con la implementación anterior carácter por carácter y re.sub().
+
+Ej. python benchmarks/bench_text.py [size]
+"""
+
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+
+import django
+
+django.setup()
+
+from unoletutils.libs.text import CODENAME_CHARS, Text
+
+
+def benchmark(size: int=1000000, seed: int=0) -> dict:
+    """Retorna {nombre: (anterior, actual)} en segundos."""
+    rnd = random.Random(seed)
+    words = ["Café", "JOSÉ", "pérez", "Ñandú", "azul", "123", "l'eau", 
+        "S.R.L.", "$10/20", "niño", "camión", "ABC-99", "#1", "x_y"]
+    corpus = [" ".join(rnd.choice(words) for _ in range(rnd.randint(1, 6))) 
+        for _ in range(size)]
+    allow = "a-z0-9"
+
+    def format_codename_loop(string, remplace="", allowed=""):
+        permited = CODENAME_CHARS + allowed
+        out = ""
+        for char in string:
+            if not char in permited:
+                char = remplace
+            out += char
+        return out.lower()
+
+    def get_tag_resub(string):
+        t = Text.normalize(string, lower=False)
+        t = re.sub("[^" + allow + "]", "", t)
+        t = " ".join(t.split())
+        t = t.replace("/", " ").replace("\\", " ").replace("'", "")
+        t = t.replace('"', '').replace("$", "").replace("\n", " ")
+        return t.lower()
+
+    def get_tags_resub(string):
+        t = Text.normalize(string)
+        t = re.sub("[^ " + allow + "]", "", t)
+        t = t.replace("/", " ").replace("\\", " ").replace("'", "")
+        t = t.replace('"', '').replace("$", "").replace("\n", " ")
+        return t.strip()
+
+    # Textos ya normalizados, Ej. códigos y slugs.
+    ascii_corpus = [Text.normalize(v, lower=False) for v in corpus]
+
+    cases = {
+        "format_codename": (lambda v: format_codename_loop(v, "-"), 
+            lambda v: Text.format_codename(v, "-"), corpus),
+        "format_codename(ascii)": (lambda v: format_codename_loop(v, "-"), 
+            lambda v: Text.format_codename(v, "-"), ascii_corpus),
+        "get_tag(allow)": (get_tag_resub, 
+            lambda v: Text.get_tag(v, allow=allow), corpus),
+        "get_tags(allow)": (get_tags_resub, 
+            lambda v: Text.get_tags(v, allow=allow), corpus),
+    }
+    out = {}
+    for (name, (previous, current, strings)) in cases.items():
+        times = []
+        results = []
+        for function in (previous, current):
+            start = time.perf_counter()
+            results.append([function(v) for v in strings])
+            times.append(time.perf_counter() - start)
+        if results[0] != results[1]:
+            raise ValueError(f"'{name}' no produce el mismo resultado.")
+        out[name] = tuple(times)
+    return out
+
+
+if __name__ == "__main__":
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    for (name, (previous, current)) in benchmark(size).items():
+        print(f"{name}: {previous:.3f}s -> {current:.3f}s")
@@ -0,0 +1,15 @@
+"""
+Pruebas de unoletutils. Se ejecutan desde la raíz del repositorio con:
+    python -m unittest discover -s tests -t .
+"""
+
+import os
+
+import django
+from django.core.management import call_command
+
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "tests.settings")
+django.setup()
+# Base de datos en memoria, incluye los modelos de tests.testapp.
+call_command("migrate", run_syncdb=True, verbosity=0)
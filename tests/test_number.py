@@ -0,0 +1,85 @@
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+
+from unoletutils.libs.number import (MontoFormatter, Number, 
+    get_monto_formatter)
+
+
+TEXTOS = ["1,234.56", "$ 99", "RD$ 1,000.5.7", "", "abc", "0.001", "12 345", 
+    "Ñ 7", "-5", "."]
+
+
+class NumberTest(SimpleTestCase):
+
+    def test_decimal_intext(self):
+        self.assertEqual(Number.Decimal("99", intext=True), "99.0")
+        self.assertEqual(Number.Decimal("$1,234.50", intext=True), "1234.5")
+        self.assertEqual(Number.Decimal("0.1"), Decimal("0.1"))
+
+
+class ColumnTest(SimpleTestCase):
+
+    def assertSameAsScalar(self, column, scalar, textos):
+        self.assertEqual(column(textos, on_error_return=None), 
+            [scalar(texto, on_error_return=None) for texto in textos])
+
+    def test_int_column(self):
+        self.assertSameAsScalar(Number.IntColumn, Number.Int, TEXTOS)
+
+    def test_float_column(self):
+        self.assertSameAsScalar(Number.FloatColumn, Number.Float, TEXTOS)
+
+    def test_decimal_column(self):
+        self.assertSameAsScalar(Number.DecimalColumn, Number.Decimal, TEXTOS)
+
+    def test_mixed_values(self):
+        # Valores que no son texto o con saltos de línea, uno por uno.
+        textos = ["1.5", 2, "3\n4", None]
+        for (column, scalar) in ((Number.IntColumn, Number.Int), 
+            (Number.FloatColumn, Number.Float), 
+            (Number.DecimalColumn, Number.Decimal)):
+            self.assertSameAsScalar(column, scalar, textos)
+
+    def test_raise_exception(self):
+        for column in (Number.IntColumn, Number.FloatColumn, 
+            Number.DecimalColumn):
+            with self.assertRaises(ValueError):
+                column(["1", "abc"])
+        self.assertEqual(Number.DecimalColumn(["1", ""]), 
+            [Decimal("1"), Decimal()])
+
+
+class MontoFormatterTest(SimpleTestCase):
+
+    MONTOS = [Decimal("1234.5"), Decimal("-0.01"), Decimal("0"), 
+        Decimal("-1234567.891"), 10, 2.675]
+
+    def test_monto_text(self):
+        for moneda in ("DOP", "", "{x}", 5):
+            formatter = MontoFormatter(moneda)
+            self.assertEqual(formatter.format_many(self.MONTOS), 
+                [Number.MontoText(monto, moneda) for monto in self.MONTOS])
+
+    def test_monto_html(self):
+        formatter = MontoFormatter("DOP", html=True)
+        expected = [Number.MontoHtml(monto, "DOP") for monto in self.MONTOS]
+        self.assertEqual(formatter.format_many(self.MONTOS), expected)
+        self.assertEqual([formatter(monto) for monto in self.MONTOS], expected)
+
+    def test_set_coin(self):
+        formatter = MontoFormatter(None, simbolo="$", fixed=False)
+        for monto in self.MONTOS:
+            self.assertEqual(formatter.format(monto), 
+                f"${round(monto, 2):,}")
+
+    def test_write(self):
+        chunks = []
+        MontoFormatter("DOP").format_many([1, 2], write=chunks.append, 
+            sep="|")
+        self.assertEqual(chunks, ["1.00 DOP|2.00 DOP"])
+
+    def test_get_monto_formatter(self):
+        formatter = get_monto_formatter("DOP", html=True)
+        self.assertIs(get_monto_formatter("DOP", html=True), formatter)
+        self.assertIsNot(get_monto_formatter("DOP"), formatter)
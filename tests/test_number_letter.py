@@ -0,0 +1,46 @@
+from decimal import Decimal
+
+from django.test import SimpleTestCase
+
+from unoletutils.libs import number_letter
+from unoletutils.libs.number_letter import numero_a_letras, numero_a_moneda
+
+
+class NumeroALetrasTest(SimpleTestCase):
+
+    def test_words(self):
+        cases = {
+            0: "cero",
+            20: "veinte",
+            21: "veintiuno",
+            100: "cien",
+            101: "ciento uno",
+            400: "cuatrocientos",
+            1000: "mil",
+            21000: "veintiun mil",
+            1000001: "un millon uno",
+            2000000: "dos millones",
+        }
+        for (numero, letras) in cases.items():
+            self.assertEqual(numero_a_letras(numero), letras)
+
+    def test_above_previous_max(self):
+        # El máximo anterior era 999999999999.
+        self.assertEqual(numero_a_letras(10 ** 12), "un billon")
+        self.assertEqual(numero_a_letras(10 ** 12 + 1), "un billon uno")
+        with self.assertRaises(OverflowError):
+            numero_a_letras(number_letter.MAX_NUMERO + 1)
+
+    def test_decimal_cents(self):
+        self.assertEqual(numero_a_moneda(Decimal("1.005")), 
+            "un pesos con un centavo")
+        self.assertEqual(numero_a_moneda(1.005), "un pesos con un centavo")
+        self.assertEqual(numero_a_moneda(Decimal("20.995")), 
+            "veintiun pesos con cero centavos")
+        self.assertEqual(numero_a_letras(Decimal("0.5")), "cero punto cincuenta")
+
+    def test_previous_names(self):
+        self.assertEqual(number_letter.leer_miles(21000), "veintiun mil")
+        self.assertEqual(number_letter.leer_millones(1000001), "un millon uno")
+        self.assertEqual(number_letter.leer_millardos(2 * 10 ** 9), 
+            "dos mil millones")
@@ -0,0 +1,48 @@
+import os
+import shutil
+import tempfile
+import time
+
+from django.test import SimpleTestCase
+
+from unoletutils.libs.pdf import PDFCache
+
+
+class PDFCacheTest(SimpleTestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+
+    def test_evict_keeps_temporary_files(self):
+        cache = PDFCache(self.directory, max_size=10)
+        tmp = os.path.join(self.directory, f"{'a' * 64}.pdf.1.tmp")
+        with open(tmp, "wb") as f:
+            f.write(b"x" * 100)
+        key = PDFCache.get_key("<p>1</p>")
+        cache.set(key, b"%PDF-1")
+        self.assertTrue(os.path.exists(tmp))
+        with cache.open(key) as f:
+            self.assertEqual(f.read(), b"%PDF-1")
+
+    def test_evict_removes_abandoned_temporary_files(self):
+        cache = PDFCache(self.directory)
+        tmp = os.path.join(self.directory, f"{'a' * 64}.pdf.1.tmp")
+        open(tmp, "wb").close()
+        old = time.time() - cache.tmp_grace_period - 1
+        os.utime(tmp, (old, old))
+        cache.evict()
+        self.assertFalse(os.path.exists(tmp))
+
+    def test_evict_least_recently_used(self):
+        cache = PDFCache(self.directory, max_size=12)
+        keys = [PDFCache.get_key(str(i)) for i in range(3)]
+        for (i, key) in enumerate(keys):
+            cache.set(key, b"%PDF-" + str(i).encode())
+            old = time.time() - 100 + i
+            os.utime(cache.get_path(key), (old, old))
+        cache.evict()
+        self.assertIsNone(cache.open(keys[0]))
+        for key in keys[1:]:
+            with cache.open(key) as f:
+                self.assertTrue(f.read().startswith(b"%PDF-"))
@@ -0,0 +1,60 @@
+import random
+import sys
+import unicodedata
+
+from django.test import SimpleTestCase
+
+from unoletutils.libs import text
+from unoletutils.libs.text import Text
+
+
+class CleanPhoneTest(SimpleTestCase):
+
+    def test_number(self):
+        self.assertEqual(Text.clean_phone(8299259531), "(829) 925-9531")
+
+    def test_string(self):
+        self.assertEqual(Text.clean_phone("8299259531"), "(829) 925-9531")
+        self.assertEqual(Text.clean_phone("829-925-9531"), "(829) 925-9531")
+
+
+def normalize_previous(string, lower=True):
+    # Implementación anterior de Text.normalize().
+    if (string is None) or (string is False) or (string is True):
+        return ""
+    string = str(string).replace("'", "").replace('"', '')
+    out = ''.join((c for c in unicodedata.normalize('NFD', string)
+        if unicodedata.category(c) != 'Mn'))
+    out = " ".join(out.split()).strip()
+    if lower:
+        out = out.lower()
+    return out
+
+
+class NormalizeTest(SimpleTestCase):
+
+    def assertSameAsPrevious(self, function, values):
+        for lower in (True, False):
+            for value in values:
+                expected = normalize_previous(value, lower)
+                if function(value, lower) != expected:
+                    self.fail(f"normalize({value!r}, lower={lower}) != "
+                        f"{expected!r}")
+
+    def test_code_points(self):
+        # Cada carácter entre letras, para incluir las marcas combinantes.
+        values = [f"a{chr(c)}b" for c in range(sys.maxunicode + 1)]
+        self.assertSameAsPrevious(text._normalize, values)
+
+    def test_samples(self):
+        rnd = random.Random(0)
+        chars = ("aAeEnNzZ09 \t\n'\"-_/\\$.,ñÑáÉíÓúüÜçß"
+            "\u0301\u0303\u00a0\u2003\u0130\ufb01\u2126\u212b\u1e9e")
+        values = [None, True, False, 0, 10.5, "", "  ", "Café  JOSÉ ", 
+            "l'eau \"Ñandú\""]
+        values += ["".join(rnd.choice(chars) for _ in range(rnd.randint(1, 
+            40))) for _ in range(5000)]
+        long_value = "".join(rnd.choice(chars) for _ in range(
+            text.NORMALIZE_CACHE_MAX_LENGTH * 3))
+        values.append(long_value)
+        self.assertSameAsPrevious(Text.normalize, values)
@@ -0,0 +1,38 @@
+from django.test import SimpleTestCase
+
+from unoletutils.libs.trigram import TrigramIndex
+
+
+class TrigramIndexTest(SimpleTestCase):
+
+    def test_add_replaces_document(self):
+        index = TrigramIndex()
+        index.add(1, "Café con leche")
+        index.add(1, "Jugo de naranja")
+        self.assertEqual(len(index), 1)
+        self.assertEqual(index.search("cafe"), [])
+        self.assertEqual(index.search("naranja")[0][0], 1)
+
+    def test_repeated_saves_are_compacted(self):
+        # Cada guardado (post_save) vuelve a agregar el mismo objeto.
+        index = TrigramIndex()
+        index.add(2, "Otro producto")
+        for i in range(100):
+            index.add(1, f"Producto {i}")
+        self.assertEqual(len(index), 2)
+        self.assertLessEqual(index.deleted, len(index.keys) * index.compact_ratio)
+        self.assertLessEqual(len(index.keys), 3)
+        self.assertEqual(len(index.sizes), len(index.keys))
+        docs = set(doc for postings in index.postings.values() for doc in postings)
+        self.assertLess(max(docs), len(index.keys))
+        self.assertEqual(index.search("producto 99")[0][0], 1)
+        self.assertEqual(dict(index.search("otro"))[2], 1.0)
+
+    def test_remove(self):
+        index = TrigramIndex()
+        index.add(1, "Mesa")
+        index.add(2, "Silla")
+        index.remove(1)
+        self.assertNotIn(1, index)
+        self.assertEqual(index.search("mesa"), [])
+        self.assertEqual(index.search("silla")[0][0], 2)
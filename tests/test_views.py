@@ -0,0 +1,125 @@
+from django.contrib.auth.models import User
+from django.http import Http404
+from django.test import RequestFactory, TestCase
+
+from unoletutils.libs import pagination
+from unoletutils.views import (BatchPrintView, DetailView, JsonDetailMixin, 
+    ListView)
+from tests.testapp.models import Company, Document
+
+
+class BatchPrintViewTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username="user")
+        cls.company = Company.objects.create(name="A")
+        cls.company.users.add(cls.user)
+        cls.other = Company.objects.create(name="B")
+        cls.document = Document.objects.create(company=cls.company, name="a")
+        cls.other_document = Document.objects.create(company=cls.other, 
+            name="b")
+
+    def get_objects(self, company, query=""):
+        request = RequestFactory().get("/" + query)
+        request.user = self.user
+        request.company = company
+        view = BatchPrintView(model=Document)
+        view.setup(request, company=company.pk)
+        return view.get_batch_objects()
+
+    def test_only_current_company(self):
+        self.assertEqual(self.get_objects(self.company), [self.document])
+        query = f"?pk={self.document.pk}&pk={self.other_document.pk}"
+        self.assertEqual(self.get_objects(self.company, query), [self.document])
+
+    def test_other_company(self):
+        with self.assertRaises(Http404):
+            self.get_objects(self.other, f"?pk={self.other_document.pk}")
+
+    def test_inactive_company(self):
+        Company.objects.filter(pk=self.company.pk).update(is_active=False)
+        self.company.refresh_from_db()
+        with self.assertRaises(Http404):
+            self.get_objects(self.company)
+
+    def test_invalid_pk(self):
+        with self.assertRaises(Http404):
+            self.get_objects(self.company, "?pk=1&pk=x")
+
+
+class CountCacheKeyTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.company = Company.objects.create(name="A")
+        Document.objects.create(company=cls.company, name="a")
+        Document.objects.create(company=cls.company, name="b", is_printed=True)
+
+    def get_view(self, view_class):
+        request = RequestFactory().get("/")
+        request.company = self.company
+        view = view_class(model=Document)
+        view.setup(request, company=self.company.pk)
+        return view
+
+    def test_scoped_queryset(self):
+        class PrintedListView(ListView):
+            count_strategy = pagination.COUNT_CACHED
+
+            def get_queryset(self):
+                return super().get_queryset().filter(is_printed=True)
+
+        class AllListView(ListView):
+            count_strategy = pagination.COUNT_CACHED
+
+        # Misma empresa y mismos filtros, distinto queryset base.
+        printed = self.get_view(PrintedListView)
+        documents = self.get_view(AllListView)
+        self.assertEqual(printed.get_count(printed.get_queryset()), (1, False))
+        self.assertEqual(documents.get_count(documents.get_queryset()), 
+            (2, False))
+
+
+class DocumentDetailView(JsonDetailMixin, DetailView):
+    model = Document
+    conditional_get = True
+
+
+class ConditionalGetTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(username="user")
+        cls.company = Company.objects.create(name="A")
+        cls.company.users.add(cls.user)
+        cls.document = Document.objects.create(company=cls.company, name="a")
+
+    def get_request(self, **headers):
+        request = RequestFactory().get("/", **headers)
+        request.user = self.user
+        request.company = self.company
+        return request
+
+    def get_etag(self, **headers):
+        view = DocumentDetailView()
+        view.setup(self.get_request(**headers), company=self.company.pk, 
+            pk=self.document.pk)
+        return view.get_etag()
+
+    def test_etag_depends_on_format(self):
+        self.assertNotEqual(self.get_etag(HTTP_ACCEPT="text/html"), 
+            self.get_etag(HTTP_ACCEPT="application/json"))
+
+    def test_not_modified_headers(self):
+        etag = self.get_etag(HTTP_ACCEPT="application/json")
+        request = self.get_request(HTTP_ACCEPT="application/json", 
+            HTTP_IF_NONE_MATCH=etag)
+        response = DocumentDetailView.as_view()(request, 
+            company=self.company.pk, pk=self.document.pk)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertIn("private", response["Cache-Control"])
+        self.assertIn("no-cache", response["Cache-Control"])
+        self.assertIn("Cookie", response["Vary"])
+        self.assertIn("Accept", response["Vary"])
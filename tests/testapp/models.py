@@ -0,0 +1,22 @@
+from django.db import models
+
+from unoletutils.models import ModelBase
+
+
+class Company(models.Model):
+    name = models.CharField(max_length=50)
+    is_active = models.BooleanField(default=True)
+    users = models.ManyToManyField("auth.User", blank=True)
+
+    def __str__(self):
+        return self.name
+
+    def user_has_access(self, user):
+        return self.users.filter(pk=user.pk).exists()
+
+
+class Document(ModelBase):
+    company = models.ForeignKey(Company, on_delete=models.CASCADE)
+    name = models.CharField(max_length=50)
+    is_printed = models.BooleanField(default=False)
+    update_date = models.DateTimeField(auto_now=True)
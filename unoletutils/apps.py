@@ -3,3 +3,4 @@ from django.apps import AppConfig
 
 class UnoletutilsConfig(AppConfig):
     name = 'unoletutils'
+    default_auto_field = 'django.db.models.AutoField'
@@ -0,0 +1,348 @@
+"""
+Variantes asíncronas (ASGI) de las vistas de unoletutils.views.
+
+Las consultas de la empresa, el objeto, la paginación y los permisos en caché
+se realizan con los métodos asíncronos del ORM y de la caché de Django (4.1+),
+sin ocupar un hilo por solicitud. Solo el trabajo bloqueante o intensivo en
+CPU (métodos de permisos del usuario, renderizado de plantillas y de PDF) se
+ejecuta en hilos o en la cola de renderizado (libs.pdf).
+
+Uso:
+    class ItemList(AsyncListView):
+        model = Item
+"""
+
+import warnings
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.views import redirect_to_login
+from django.core.exceptions import PermissionDenied
+from django.core.paginator import InvalidPage
+from django.http import Http404, HttpResponse
+from django.shortcuts import render
+from django.template.loader import render_to_string
+from django.views import generic
+
+from unoletutils import views
+from unoletutils.libs import pagination, pdf, permissions
+from unoletutils.views import (BaseList, BaseView, ObjectCapsule,
+    QuerysetCapsule, ViewError)
+
+
+async def aget_user(request):
+    """Obtiene el usuario de la solicitud sin bloquear el bucle de eventos."""
+    if hasattr(request, "auser"):
+        return await request.auser()
+
+    def get_user():
+        request.user.pk # Carga el usuario (SimpleLazyObject).
+        return request.user
+    return await sync_to_async(get_user)()
+
+
+class AsyncBaseView(BaseView):
+    """
+    BaseView cuyos métodos dispatch y get son corrutinas. Las comprobaciones
+    de la empresa, el objeto y los permisos tienen su versión asíncrona
+    (aget_company, aget_object, ...) y comparten la memoria de 'memoize'.
+    """
+
+    async def amemoize(self, key, function, *args, **kwargs):
+        """Igual que memoize() para funciones asíncronas."""
+        memo = self.__dict__.setdefault("_memo", {})
+        try:
+            value = memo[key]
+        except (KeyError):
+            value = memo[key] = await function(*args, **kwargs)
+            return value
+        self._add_lookup_avoided()
+        return value
+
+    async def aget_user(self):
+        return await self.amemoize("user", aget_user, self.request)
+
+    async def aget_company(self):
+        """Obtiene la instancia de la empresa actual."""
+        try:
+            company = self.request.company
+        except (AttributeError):
+            return await self.amemoize("company",
+                sync_to_async(self._get_company))
+        self.__dict__.setdefault("_memo", {}).setdefault("company", company)
+        return company
+
+    async def _auser_has_access(self, company):
+        user = await self.aget_user()
+        return await self.amemoize(("access", company.pk),
+            sync_to_async(company.user_has_access), user)
+
+    async def _aget_permission_entry(self):
+        cache = self.permission_cache or permissions.get_permission_cache()
+        if cache is None:
+            return None
+        user = await self.aget_user()
+        company = await self.aget_company()
+        return await self.amemoize("permission_entry", cache.aget, user,
+            company)
+
+    async def _ahas_company_permission(self, permission):
+        key = permission if isinstance(permission, str) else tuple(permission)
+        entry = await self._aget_permission_entry()
+        if entry is not None:
+            return await self.amemoize(("permission", key),
+                entry.ahas_permission, permission)
+        user = await self.aget_user()
+        return await self.amemoize(("permission", key),
+            sync_to_async(user.has_company_permission),
+            company=await self.aget_company(), permission=permission)
+
+    async def aget_object(self):
+        """Igual que get_object() utilizando el ORM asíncrono."""
+        return await self.amemoize("object", self._aget_object)
+
+    async def _aget_object(self):
+        company = await self.aget_company()
+        company_pk = self.kwargs.get(self.company_in_url)
+        pk = self.kwargs.get(self.pk_in_url)
+
+        obj = None
+        if company_pk and pk:
+            if self.model is None:
+                raise ValueError("El valor del atributo 'model' no puede ser None.")
+            filters = {self.company_field: company_pk, self.pk_field: pk}
+            try:
+                obj = await self.model._default_manager.aget(**filters)
+            except (self.model.DoesNotExist):
+                raise Http404(f"No existe {self.model._meta.verbose_name} "
+                    f"con {filters}.")
+            # El filtro garantiza que el objeto pertenece a 'company_pk', así
+            # evitamos consultar la empresa relacionada del objeto.
+            if str(company_pk) != str(company.pk):
+                raise Http404(f"La empresa {company} no es la misma empresa "
+                    f"del objeto {company_pk}")
+
+        if not company.is_active:
+            raise Http404(f"La empresa {company} no está activa.")
+
+        if not await self._auser_has_access(company):
+            raise Http404(
+                f"El usuario {self.request.user} no pertenece a {company}")
+        return obj
+
+    async def aget_user_context(self) -> dict:
+        """Permisos y grupos que posee y pertenece el usuario actual."""
+        company = await self.aget_company()
+        entry = await self._aget_permission_entry()
+        if entry is not None:
+            return {"user_company_permissions": await entry.aget_permissions(),
+                "user_company_groups": await entry.aget_groups()}
+        user = await self.aget_user()
+        return {
+            "user_company_permissions": await self.amemoize(
+                "company_permissions",
+                sync_to_async(user.get_company_permissions), company),
+            "user_company_groups": await self.amemoize("company_groups",
+                sync_to_async(user.get_company_groups), company),
+        }
+
+    async def aget_context_data(self, **kwargs):
+        kwargs.setdefault("view", self)
+        if self.extra_context is not None:
+            kwargs.update(self.extra_context)
+        kwargs.update(await self.aget_user_context())
+        return kwargs
+
+    async def dispatch(self, request, *args, **kwargs):
+        if self.error_list:
+            raise ViewError(". ".join(self.error_list))
+        if self.company_permission_required:
+            if not await self._ahas_company_permission(
+                self.company_permission_required):
+                raise PermissionDenied(
+                    "Acceso denegado. No cuenta con permisos suficientes.")
+        conditional = self.conditional_get and request.method in ("GET", "HEAD")
+        if conditional:
+            response = await sync_to_async(self.get_conditional_response)()
+            if response is not None:
+                return response
+        if request.method.lower() in self.http_method_names:
+            handler = getattr(self, request.method.lower(),
+                self.http_method_not_allowed)
+        else:
+            handler = self.http_method_not_allowed
+        response = await handler(request, *args, **kwargs)
+        if conditional and response.status_code == 200:
+            await sync_to_async(self.set_conditional_headers)(response)
+        return response
+
+
+class AsyncListView(AsyncBaseView, BaseList, generic.ListView):
+    """
+    ListView asíncrono. La página actual se obtiene con el ORM asíncrono, de
+    manera que la plantilla recibe los registros ya cargados.
+    """
+
+    async def aget_count(self, queryset):
+        """Igual que get_count() utilizando el ORM asíncrono."""
+        if isinstance(queryset, QuerysetCapsule):
+            queryset = queryset._queryset
+        strategy = self.get_count_strategy()
+        if strategy == pagination.COUNT_EXACT:
+            return await queryset.acount(), False
+        if strategy == pagination.COUNT_CACHED:
+            return (await pagination.acached_count(queryset,
+                self.get_count_cache_key(queryset), self.count_cache_timeout), 
+                False)
+        if strategy == pagination.COUNT_APPROXIMATE:
+            # EXPLAIN requiere un cursor de la base de datos.
+            return await sync_to_async(pagination.approximate_count)(queryset,
+                self.count_approximate_threshold)
+        raise ViewError(f"La estrategia '{strategy}' no es válida. Las "
+            f"estrategias permitidas son: {pagination.COUNT_STRATEGIES}.")
+
+    async def apaginate_queryset(self, queryset, page_size):
+        """
+        Igual que paginate_queryset(). Retorna (paginator, page, object_list,
+        is_paginated) con los registros de la página ya cargados.
+        """
+        if isinstance(queryset, QuerysetCapsule):
+            queryset = queryset._queryset
+        if self.cursor_pagination:
+            try:
+                page = await pagination.apaginate_by_cursor(queryset,
+                    self.get_cursor_ordering(), page_size,
+                    self.request.GET.get(self.cursor_kwarg))
+            except (pagination.PaginationError) as e:
+                raise Http404(str(e))
+            page.object_list = QuerysetCapsule(view=self,
+                queryset=page.object_list)
+            return (None, page, page.object_list, page.has_other_pages())
+
+        count = await self.aget_count(queryset)
+        paginator = pagination.CountPaginator(queryset, page_size,
+            orphans=self.get_paginate_orphans(),
+            allow_empty_first_page=self.get_allow_empty(),
+            count_function=lambda queryset: count)
+        page_kwarg = self.page_kwarg
+        page = (self.kwargs.get(page_kwarg) or
+            self.request.GET.get(page_kwarg) or 1)
+        try:
+            page_number = int(page)
+        except (ValueError):
+            if page == "last":
+                page_number = paginator.num_pages
+            else:
+                raise Http404("El número de página no es válido.")
+        try:
+            page = paginator.page(page_number)
+        except (InvalidPage) as e:
+            raise Http404(f"Página inválida ({page_number}): {e}")
+        rows = [obj async for obj in page.object_list]
+        page.object_list = QuerysetCapsule(view=self, queryset=rows)
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+    async def get(self, request, *args, **kwargs):
+        await self.aget_company()
+        if self.search_form_class is None:
+            self.object_list = self.get_queryset()
+        else:
+            # La validación del formulario puede consultar la base de datos
+            # (Ej. ModelChoiceField).
+            self.object_list = await sync_to_async(self.get_queryset)()
+        page_size = self.get_paginate_by(self.object_list)
+        if page_size:
+            paginator, page, object_list, is_paginated = (
+                await self.apaginate_queryset(self.object_list, page_size))
+        else:
+            paginator, page, is_paginated = None, None, False
+            object_list = QuerysetCapsule(view=self, queryset=[obj async
+                for obj in self.object_list._queryset])
+        if not self.get_allow_empty() and not object_list:
+            raise Http404(f"La lista está vacía y '{self.__class__.__name__}"
+                ".allow_empty' es False.")
+        context = {
+            "paginator": paginator,
+            "page_obj": page,
+            "is_paginated": is_paginated,
+            "object_list": object_list,
+        }
+        name = self.get_context_object_name(self.object_list)
+        if name is not None:
+            context[name] = object_list
+        context.update(kwargs)
+        context = self.get_list_context(await self.aget_context_data(**context))
+        return self.render_to_response(context)
+
+
+class AsyncDetailView(AsyncBaseView, generic.DetailView):
+    """DetailView asíncrono."""
+
+    async def get(self, request, *args, **kwargs):
+        obj = await self.aget_object()
+        self.object = ObjectCapsule(self, obj)
+        context = {"object": self.object}
+        name = self.get_context_object_name(self.object)
+        if name:
+            context[name] = self.object
+        context.update(kwargs)
+        return self.render_to_response(await self.aget_context_data(**context))
+
+
+class AsyncTemplateView(AsyncBaseView, generic.TemplateView):
+    """TemplateView asíncrono."""
+
+    async def get(self, request, *args, **kwargs):
+        return self.render_to_response(await self.aget_context_data(**kwargs))
+
+
+async def arender_to_pdf(request, context: dict = {},
+    template_name: str = None) -> HttpResponse:
+    """
+    Igual que views.render_to_pdf() para vistas asíncronas. La plantilla se
+    renderiza en un hilo y el PDF en la cola de renderizado, si se configuró,
+    o en un hilo aparte, sin bloquear el bucle de eventos.
+    """
+    user = await aget_user(request)
+    if not user.is_authenticated:
+        return redirect_to_login(request.get_full_path())
+    template_name = request.GET.get("template_name") or template_name
+    if not pdf.is_available():
+        warnings.warn("No se puede renderizar el HTML como un PDF porque la "
+            "libería externa weasyprint no está instalada.")
+        return await sync_to_async(render)(request, template_name, context)
+    try:
+        html = await sync_to_async(render_to_string)(template_name, context)
+    except (BaseException) as e:
+        raise Http404(f"Error obteniendo la plantilla: {e}")
+    return await ahtml_to_pdf_response(request, html, template_name, user=user)
+
+
+async def ahtml_to_pdf_response(request, html: str,
+    template_name: str = None, user=None) -> HttpResponse:
+    """Igual que views.html_to_pdf_response() para vistas asíncronas."""
+    user = user or await aget_user(request)
+    base_url = request.build_absolute_uri()
+    cache = pdf.get_cache()
+    cache_key = None
+    if cache is not None:
+        cache_key = cache.get_key(html, template_name, base_url)
+        f = cache.open(cache_key)
+        if f is not None:
+            return views.pdf_file_response(f)
+
+    queue = pdf.get_queue()
+    if queue is None:
+        # Un hilo fuera del hilo compartido de sync_to_async, para que varios
+        # documentos puedan renderizarse a la vez.
+        content, timings = await sync_to_async(views.render_pdf_content,
+            thread_sensitive=False)(html, base_url, cache, cache_key)
+        return views.pdf_timing_response(content, timings)
+    try:
+        job_id = queue.submit(html, base_url, owner=user.pk,
+            cache_key=cache_key)
+    except (pdf.PDFQueueFull) as e:
+        return views.pdf_queue_full_response(e)
+    if await queue.await_job(job_id, pdf.get_deadline()):
+        return await sync_to_async(views.pdf_job_result_response,
+            thread_sensitive=False)(queue, job_id, cache, cache_key)
+    return views.pdf_job_status_response(queue, job_id)
@@ -1,4 +1,4 @@
 
-from unoletutils.libs import (icons, json, number_letter, number, text, 
-    utils, var)
-
+from unoletutils.libs import (filters, icons, json, number_letter, number, 
+    pagination, pdf, permissions, table, text, trigram, utils, validation, 
+    var, versioning)
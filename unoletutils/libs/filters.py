@@ -0,0 +1,116 @@
+"""
+Planes de filtrado compilados para los formularios de búsqueda de los listados.
+"""
+
+import logging
+import time
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models.constants import LOOKUP_SEP
+
+
+logger = logging.getLogger(__name__)
+
+# Planes compilados por (modelo, clase del formulario).
+PLANS = {}
+
+# Valores que no filtran el queryset.
+EMPTY_VALUES = ("", None, [], (), {})
+
+
+def get_field(model, name):
+    """Obtiene el campo del modelo con el nombre indicado o None."""
+    opts = model._meta
+    if name == "pk":
+        return opts.pk
+    try:
+        return opts.get_field(name)
+    except (FieldDoesNotExist):
+        return None
+
+
+def is_valid_lookup(model, key: str) -> bool:
+    """
+    Comprueba si 'key' es un filtro válido para el modelo, sin consultar la base
+    de datos. Ej. 'name', 'name__icontains', 'doctype__company__pk__in'.
+    """
+    parts = key.split(LOOKUP_SEP)
+    field = None
+    current = model
+    for i, part in enumerate(parts):
+        if current is not None:
+            f = get_field(current, part)
+            if f is not None:
+                field = f
+                current = f.related_model if f.is_relation else None
+                continue
+        if field is None:
+            return False
+        # El resto son transformaciones (Ej. 'year') y un lookup final.
+        rest = parts[i:]
+        for name in rest[:-1]:
+            if field.get_transform(name) is None:
+                return False
+        return bool(field.get_lookup(rest[-1]) or field.get_transform(rest[-1]))
+    return field is not None
+
+
+class FilterPlan:
+    """
+    Plan de filtrado para un modelo. Cada clave se valida una sola vez y el
+    resultado se recuerda, de manera que en cada solicitud solo se aplican las
+    claves válidas en una sola llamada a filter().
+    """
+
+    def __init__(self, model, keys=()):
+        self.model = model
+        self.lookups = {}
+        for key in keys:
+            self.compile(key)
+
+    def __repr__(self):
+        return f"<FilterPlan {self.model.__name__} {self.get_valid_keys()}>"
+
+    def compile(self, key: str) -> bool:
+        """Valida la clave indicada y recuerda el resultado."""
+        try:
+            return self.lookups[key]
+        except (KeyError):
+            pass
+        valid = self.lookups[key] = is_valid_lookup(self.model, key)
+        if not valid:
+            logger.warning("'%s' no es un filtro válido para %s y será omitido.",
+                key, self.model.__name__)
+        return valid
+
+    def get_valid_keys(self) -> list:
+        return [key for (key, valid) in self.lookups.items() if valid]
+
+    def get_filters(self, data: dict) -> dict:
+        """Obtiene los filtros válidos y no vacíos del diccionario indicado."""
+        return {key: value for (key, value) in data.items()
+            if (value not in EMPTY_VALUES) and self.compile(key)}
+
+    def apply(self, queryset, data: dict):
+        """Aplica al queryset los filtros del diccionario indicado."""
+        start = time.perf_counter()
+        filters = self.get_filters(data)
+        if filters:
+            queryset = queryset.filter(**filters)
+        logger.debug("Filtros %s aplicados a %s en %.3f ms.", filters,
+            self.model.__name__, (time.perf_counter() - start) * 1000)
+        return queryset
+
+
+def get_filter_plan(model, form_class) -> FilterPlan:
+    """
+    Obtiene el plan de filtrado para (modelo, clase del formulario),
+    compilándolo a partir de los campos del formulario la primera vez.
+    """
+    key = (model, form_class)
+    try:
+        return PLANS[key]
+    except (KeyError):
+        pass
+    plan = PLANS[key] = FilterPlan(model, getattr(form_class, "base_fields", ()))
+    return plan
@@ -2,9 +2,17 @@
 Trabajar con archivos Json, a traves del módulo Python 'json'.
 """
 
+import datetime
+import decimal
+import operator
 import os
 import json
 
+from django.db import models
+from django.db.models.constants import LOOKUP_SEP
+
+from unoletutils.libs.filters import get_field
+
 
 load = json.load
 loads = json.loads
@@ -84,4 +92,124 @@ def jsonbackup_clear(jsondata):
         l = [dic["pk"]] + list(dic["fields"].values())
         out[dic["model"]]["vals"].append(l)
 
-    return out
\ No newline at end of file
+    return out
+
+
+# Codificadores de filas compilados por (modelo, columnas).
+ROW_ENCODERS = {}
+
+
+def encode_value(value):
+    """Convierte el valor indicado en un valor serializable a Json."""
+    if value is None or isinstance(value, (str, bool, int, float)):
+        return value
+    if isinstance(value, decimal.Decimal):
+        # Como texto, para no perder precisión.
+        return str(value)
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, datetime.timedelta):
+        return value.total_seconds()
+    if isinstance(value, (list, tuple)):
+        return [encode_value(v) for v in value]
+    if callable(value):
+        return encode_value(value())
+    return str(value)
+
+
+def _encode_native(value):
+    return value
+
+
+def _encode_str(value):
+    return None if value is None else str(value)
+
+
+def _encode_isoformat(value):
+    return None if value is None else value.isoformat()
+
+
+def get_field_encoder(field):
+    """
+    Obtiene la función que codifica los valores del campo indicado. Los campos
+    con opciones (choices) se codifican con el texto a mostrar.
+    """
+    if field is None or field.is_relation:
+        return encode_value
+    if field.flatchoices:
+        choices = dict(field.flatchoices)
+        return lambda value: encode_value(choices.get(value, value))
+    if isinstance(field, models.DecimalField):
+        return _encode_str
+    if isinstance(field, (models.DateField, models.TimeField)):
+        return _encode_isoformat
+    if isinstance(field, (models.BooleanField, models.IntegerField, 
+        models.FloatField, models.CharField, models.TextField)):
+        return _encode_native
+    return encode_value
+
+
+def get_column_getter(model, name: str):
+    """
+    Obtiene (función, campo) para leer la columna 'name' de los objetos del
+    modelo. El nombre puede contener campos relacionados, Ej. 'doctype__name'.
+    Si un objeto relacionado intermedio es None el valor será None.
+    """
+    if name == "__str__":
+        return str, None
+    names = name.split(LOOKUP_SEP)
+    field = None
+    current = model
+    for n in names:
+        field = get_field(current, n) if current is not None else None
+        current = field.related_model if (field is not None and 
+            field.is_relation) else None
+    getter = operator.attrgetter(".".join(names))
+    if len(names) == 1:
+        return getter, field
+
+    def get(obj):
+        try:
+            return getter(obj)
+        except (AttributeError):
+            return None
+    return get, field
+
+
+class RowEncoder:
+    """
+    Convierte los objetos de un modelo en diccionarios serializables a Json
+    con su pk y las columnas indicadas. La lectura y el codificador de cada
+    columna se determinan una sola vez a partir de los campos del modelo.
+    """
+
+    def __init__(self, model, names):
+        self.model = model
+        self.names = tuple(names)
+        self.columns = []
+        for name in self.names:
+            getter, field = get_column_getter(model, name)
+            self.columns.append((name, getter, get_field_encoder(field)))
+
+    def __repr__(self):
+        return f"<RowEncoder {self.model.__name__} {self.names}>"
+
+    def encode(self, obj) -> dict:
+        row = {"pk": encode_value(obj.pk)}
+        for (name, getter, encoder) in self.columns:
+            row[name] = encoder(getter(obj))
+        return row
+
+    def dumps(self, obj) -> str:
+        return dumps(self.encode(obj), separators=(",", ":"), default=str)
+
+
+def get_row_encoder(model, names) -> RowEncoder:
+    """Obtiene el codificador de filas para (modelo, columnas)."""
+    key = (model, tuple(names))
+    try:
+        return ROW_ENCODERS[key]
+    except (KeyError):
+        pass
+    encoder = ROW_ENCODERS[key] = RowEncoder(model, names)
+    return encoder
@@ -2,8 +2,81 @@
 Módulo para trabajar con números.
 """
 
-from decimal import Decimal
+import itertools
+from decimal import Decimal, InvalidOperation
 
+try:
+    import numpy
+except (ImportError):
+    numpy = None
+
+
+DIGITS = "0123456789"
+
+# Formateadores de montos por (moneda, decimales, html, símbolo, fixed).
+FORMATTERS = {}
+
+
+class _KeepTable(dict):
+    """
+    Tabla para str.translate() que conserva los caracteres indicados y
+    elimina el resto. Cada carácter se evalúa una sola vez.
+    """
+
+    def __init__(self, keep: str):
+        self.keep = keep
+
+    def __missing__(self, key):
+        char = chr(key)
+        value = self[key] = char if char in self.keep else None
+        return value
+
+
+def _get_delete(keep: str) -> bytes:
+    return bytes(i for i in range(128) if chr(i) not in keep)
+
+
+# Tablas para obtener solo los dígitos (Int) o los dígitos y el punto (Float
+# y Decimal). Las terminadas en _LINES conservan los saltos de línea, con los
+# que se separan los textos de una columna (IntColumn, FloatColumn...).
+_INT_DELETE = _get_delete(DIGITS)
+_INT_TABLE = _KeepTable(DIGITS)
+_FLOAT_DELETE = _get_delete(DIGITS + ".")
+_FLOAT_TABLE = _KeepTable(DIGITS + ".")
+_FLOAT_DELETE_LINES = _get_delete(DIGITS + ".\n")
+_FLOAT_TABLE_LINES = _KeepTable(DIGITS + ".\n")
+
+
+def _clean(texto: str, delete: bytes, table: dict) -> str:
+    if texto.isascii():
+        return texto.encode("ascii").translate(None, delete).decode("ascii")
+    return texto.translate(table)
+
+
+def _clean_column(textos: list, delete: bytes, table: dict) -> list:
+    """
+    Limpia todos los textos de una vez, uniéndolos por saltos de línea.
+    Retorna None si algún texto contiene un salto de línea.
+    """
+    joined = "\n".join(textos)
+    if joined.count("\n") != len(textos) - 1:
+        return None
+    return _clean(joined, delete, table).split("\n")
+
+
+def _int_head(n: str) -> int:
+    return int(n.partition(".")[0])
+
+
+def _to_array(values: list, dtype):
+    if numpy is None:
+        raise ImportError("NumPy no está instalado.")
+    try:
+        return numpy.array(values, dtype=dtype)
+    except (TypeError, ValueError, OverflowError):
+        # Valores de error (on_error_return) o enteros demasiado grandes.
+        # Con float64, None se convierte en NaN.
+        return numpy.array(values, dtype=object)
 
 
 class Number:
@@ -28,12 +101,7 @@ class Number:
                     return on_error_return
                 raise ValueError(e)
 
-        n = ""
-        for c in texto:
-            if c == ".":
-                break
-            elif c in ("0", "1", "2", "3", "4", "5", "6", "7", "8", "9"):
-                n += c
+        n = _clean(texto.partition(".")[0], _INT_DELETE, _INT_TABLE)
 
         try:
             n = int(n)
@@ -61,10 +129,7 @@ class Number:
                     return on_error_return
                 raise ValueError(e)
 
-        n = ""
-        for c in texto:
-            if c in ("0", "1", "2", "3", "4", "5", "6", "7", "8", "9", "."):
-                n += c
+        n = _clean(texto, _FLOAT_DELETE, _FLOAT_TABLE)
 
         try:
             n = float(n)
@@ -82,7 +147,8 @@ class Number:
         """
         Obtiene un número Decimal a partir del texto introduccido,
         eliminado los carácteres que no sean numéricos, exceptuando el punto.
-        Si 'intext' es True, retorna el número como un objeto string.
+        Si 'intext' es True, retorna el número como un objeto string, con el
+        mismo formato que Float() (Ej. '99.0').
         """
         if (not isinstance(texto, str)):
             try:
@@ -94,18 +160,73 @@ class Number:
 
         if not texto:
             return Decimal()
-        floatObj = self.Float(texto, intext)
+        n = _clean(texto, _FLOAT_DELETE, _FLOAT_TABLE)
 
+        # Sin pasar por float, para no perder precisión.
         try:
-            n = Decimal(floatObj)
-        except (BaseException) as e:
+            n = Decimal(n)
+        except (InvalidOperation) as e:
             if (on_error_return != "raise_exception"):
                 return on_error_return
             raise ValueError(e)
 
         if intext:
-            return floatObj
-        return Decimal(str(floatObj))
+            return str(float(n))
+        return n
+
+    @classmethod
+    def _column(self, textos, function, delete, table, convert, empty,
+        on_error_return, array, dtype):
+        textos = list(textos)
+        pieces = None
+        if all(isinstance(texto, str) for texto in textos):
+            pieces = _clean_column(textos, delete, table)
+        if pieces is None:
+            out = [function(texto, on_error_return=on_error_return) 
+                for texto in textos]
+        else:
+            out = []
+            append = out.append
+            for (texto, n) in zip(textos, pieces):
+                if not texto and empty is not None:
+                    append(empty)
+                    continue
+                try:
+                    append(convert(n))
+                except (ValueError, InvalidOperation) as e:
+                    if (on_error_return == "raise_exception"):
+                        raise ValueError(e)
+                    append(on_error_return)
+        if array:
+            return _to_array(out, dtype)
+        return out
+
+    @classmethod
+    def IntColumn(self, textos, on_error_return="raise_exception", 
+        array=False):
+        """
+        Igual que Int() para una columna de textos (Ej. importaciones desde
+        hojas de cálculo), limpiándolos todos de una vez.
+        Si 'array' es True, retorna un numpy.ndarray (requiere NumPy).
+        """
+        # Se conservan los puntos para omitir lo que sigue al primero.
+        return self._column(textos, self.Int, _FLOAT_DELETE_LINES, 
+            _FLOAT_TABLE_LINES, _int_head, None, on_error_return, array, 
+            "int64")
+
+    @classmethod
+    def FloatColumn(self, textos, on_error_return="raise_exception", 
+        array=False):
+        """Igual que Float() para una columna de textos, ver IntColumn()."""
+        return self._column(textos, self.Float, _FLOAT_DELETE_LINES, 
+            _FLOAT_TABLE_LINES, float, None, on_error_return, array, "float64")
+
+    @classmethod
+    def DecimalColumn(self, textos, on_error_return="raise_exception"):
+        """Igual que Decimal() para una columna de textos, ver IntColumn()."""
+        return self._column(textos, self.Decimal, _FLOAT_DELETE_LINES, 
+            _FLOAT_TABLE_LINES, Decimal, Decimal(), on_error_return, False, 
+            None)
 
     @classmethod
     def MontoText(self, monto, moneda="", html=False):
@@ -119,4 +240,88 @@ class Number:
 
     @classmethod
     def MontoHtml(self, monto, moneda=""):
-        return self.MontoText(monto, moneda, True)
\ No newline at end of file
+        return self.MontoText(monto, moneda, True)
+
+
+def _escape_format(text: str) -> str:
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+class MontoFormatter:
+    """
+    Formateador de montos con la moneda, los decimales y las plantillas HTML
+    precalculados, para reportes con miles de montos.
+
+    Produce el mismo texto que Number.MontoText() y Number.MontoHtml(), o que
+    Text.set_coin() si 'fixed' es False (el monto se redondea a 'ndec'
+    decimales y se muestra sin completar los decimales).
+
+    Parameters:
+        moneda (str): moneda al final del monto, None para omitirla.
+        ndec (int): cantidad de decimales.
+        html (bool): envuelve el monto en un <span>, en rojo si es negativo.
+        simbolo (str): símbolo al inicio del monto, Ej. '$'.
+        fixed (bool): si es False, no se completan los decimales.
+    """
+
+    def __init__(self, moneda="", ndec: int=2, html: bool=False, 
+        simbolo: str="", fixed: bool=True):
+        if moneda is not None and not isinstance(moneda, str):
+            moneda = ""
+        self.moneda = moneda
+        self.ndec = ndec
+        self.html = html
+        self.simbolo = simbolo
+        self.fixed = fixed
+        spec = f",.{ndec}f" if fixed else ","
+        template = "{}{{:{}}}{}".format(_escape_format(simbolo), spec, 
+            "" if moneda is None else _escape_format(f" {moneda}"))
+        self._positive = self._negative = template.format
+        if html:
+            self._positive = f"<span>{template}</span>".format
+            self._negative = f'<span style="color: red">{template}</span>'.format
+
+    def __repr__(self):
+        return (f"<MontoFormatter moneda={self.moneda!r} ndec={self.ndec} "
+            f"html={self.html}>")
+
+    def format(self, monto) -> str:
+        """Obtiene el texto del monto indicado."""
+        if not self.fixed:
+            monto = round(monto, self.ndec)
+        if self.html and monto < 0:
+            return self._negative(monto)
+        return self._positive(monto)
+
+    __call__ = format
+
+    def format_many(self, montos, write=None, sep: str=""):
+        """
+        Obtiene la lista de textos de los montos indicados (Ej. una columna
+        de un reporte). Si se indica 'write' (Ej. buffer.write), los textos
+        se escriben en él separados por 'sep' y no se retorna nada.
+        """
+        if not self.fixed:
+            montos = map(round, montos, itertools.repeat(self.ndec))
+        if self.html:
+            positive, negative = self._positive, self._negative
+            out = [negative(monto) if monto < 0 else positive(monto) 
+                for monto in montos]
+        else:
+            out = list(map(self._positive, montos))
+        if write is None:
+            return out
+        write(sep.join(out))
+
+
+def get_monto_formatter(moneda="", ndec: int=2, html: bool=False, 
+    simbolo: str="", fixed: bool=True) -> MontoFormatter:
+    """Obtiene el formateador (reutilizable) con las opciones indicadas."""
+    key = (moneda, ndec, html, simbolo, fixed)
+    try:
+        return FORMATTERS[key]
+    except (KeyError):
+        pass
+    formatter = FORMATTERS[key] = MontoFormatter(moneda, ndec, html, simbolo, 
+        fixed)
+    return formatter
@@ -1,13 +1,23 @@
+"""
+Conversión de números a letras (Ej. montos de facturas y cheques).
+
+Las palabras de 0 a 999 se calculan una sola vez al importar el módulo y los
+números mayores se leen por grupos de seis cifras con las escalas de SCALES
+(escala larga: millon, billon, trillon). Los decimales se redondean a dos
+cifras con Decimal, evitando los errores de redondeo de float.
+"""
+
 __author__ = 'efrenfuentes'
 
+from decimal import Decimal, ROUND_HALF_UP
+
+
 MONEDA_SINGULAR = 'peso'
 MONEDA_PLURAL = 'pesos'
 
 CENTIMOS_SINGULAR = 'centavo'
 CENTIMOS_PLURAL = 'centavos'
 
-MAX_NUMERO = 999999999999
-
 UNIDADES = (
     'cero',
     'uno',
@@ -52,7 +62,7 @@ CIENTOS = (
     'ciento',
     'doscientos',
     'trescientos',
-    'cuatroscientos',
+    'cuatrocientos',
     'quinientos',
     'seiscientos',
     'setecientos',
@@ -60,124 +70,158 @@ CIENTOS = (
     'novecientos'
 )
 
-def numero_a_letras(numero):
-    numero_entero = int(numero)
-    if numero_entero > MAX_NUMERO:
-        raise OverflowError('Número demasiado alto')
-    if numero_entero < 0:
-        return 'menos %s' % numero_a_letras(abs(numero))
-    letras_decimal = ''
-    parte_decimal = int(round((abs(numero) - abs(numero_entero)) * 100))
-    if parte_decimal > 9:
-        letras_decimal = 'punto %s' % numero_a_letras(parte_decimal)
-    elif parte_decimal > 0:
-        letras_decimal = 'punto cero %s' % numero_a_letras(parte_decimal)
-    if (numero_entero <= 99):
-        resultado = leer_decenas(numero_entero)
-    elif (numero_entero <= 999):
-        resultado = leer_centenas(numero_entero)
-    elif (numero_entero <= 999999):
-        resultado = leer_miles(numero_entero)
-    elif (numero_entero <= 999999999):
-        resultado = leer_millones(numero_entero)
-    else:
-        resultado = leer_millardos(numero_entero)
-    resultado = resultado.replace('uno mil', 'un mil')
-    resultado = resultado.strip()
-    resultado = resultado.replace(' _ ', ' ')
-    resultado = resultado.replace('  ', ' ')
-    if parte_decimal > 0:
-        resultado = '%s %s' % (resultado, letras_decimal)
-    return resultado
+# Escalas de cada grupo de seis cifras (singular, plural).
+SCALES = (
+    ('', ''),
+    ('millon', 'millones'),
+    ('billon', 'billones'),
+    ('trillon', 'trillones'),
+)
 
-def numero_a_moneda(numero, moneda="pesos"):
+MAX_NUMERO = 10 ** (6 * len(SCALES)) - 1
 
-    if not moneda:
-        moneda = MONEDA_PLURAL
-    moneda = moneda.lower()
+CENTAVO = Decimal('0.01')
 
-    numero_entero = int(numero)
-    parte_decimal = int(round((abs(numero) - abs(numero_entero)) * 100))
-    centimos = ''
-    if parte_decimal == 1:
-        centimos = CENTIMOS_SINGULAR
-    else:
-        centimos = CENTIMOS_PLURAL
-    #moneda = ''
-    #if numero_entero == 1:
-    #    moneda = MONEDA_SINGULAR
-    #else:
-    #    moneda = MONEDA_PLURAL
-    letras = numero_a_letras(numero_entero)
-    letras = letras.replace('uno', 'un')
-    letras_decimal = 'con %s %s' % (numero_a_letras(parte_decimal).replace('uno', 'un'), centimos)
-    letras = '%s %s %s' % (letras, moneda, letras_decimal)
-    return letras
 
 def leer_decenas(numero):
     if numero < 10:
         return UNIDADES[numero]
     decena, unidad = divmod(numero, 10)
     if numero <= 19:
-        resultado = DECENAS[unidad]
-    elif numero <= 29:
-        resultado = 'veinti%s' % UNIDADES[unidad]
-    else:
-        resultado = DIEZ_DIEZ[decena]
-        if unidad > 0:
-            resultado = '%s y %s' % (resultado, UNIDADES[unidad])
-    return resultado
+        return DECENAS[unidad]
+    if unidad == 0:
+        return DIEZ_DIEZ[decena]
+    if numero <= 29:
+        return 'veinti%s' % UNIDADES[unidad]
+    return '%s y %s' % (DIEZ_DIEZ[decena], UNIDADES[unidad])
+
 
 def leer_centenas(numero):
     centena, decena = divmod(numero, 100)
-    if numero == 0:
-        resultado = 'cien'
-    else:
-        resultado = CIENTOS[centena]
-        if decena > 0:
-            resultado = '%s %s' % (resultado, leer_decenas(decena))
-    return resultado
+    if centena == 0:
+        return leer_decenas(decena)
+    if numero == 100:
+        return 'cien'
+    if decena == 0:
+        return CIENTOS[centena]
+    return '%s %s' % (CIENTOS[centena], leer_decenas(decena))
+
+
+def _apocopar(letras):
+    # 'uno' pierde la 'o' delante de un sustantivo (un mil, veintiun pesos).
+    if letras.endswith('uno'):
+        return letras[:-1]
+    return letras
+
 
+# Palabras de 0 a 999, precalculadas.
+LETRAS = tuple(leer_centenas(n) for n in range(1000))
+# Igual que LETRAS pero terminadas en 'un' en lugar de 'uno'.
+LETRAS_APOCOPE = tuple(_apocopar(letras) for letras in LETRAS)
+
+
+def leer_entero(numero, apocope=False):
+    """
+    Obtiene las palabras del entero positivo indicado. Si apocope es True,
+    el número termina en 'un' en lugar de 'uno' (Ej. delante de la moneda).
+    """
+    if numero < 1000:
+        return (LETRAS_APOCOPE if apocope else LETRAS)[numero]
+    if numero > MAX_NUMERO:
+        raise OverflowError('Número demasiado alto')
+    grupos = []
+    while numero:
+        numero, grupo = divmod(numero, 1000000)
+        grupos.append(grupo)
+    palabras = []
+    for escala in range(len(grupos) - 1, -1, -1):
+        grupo = grupos[escala]
+        if grupo == 0:
+            continue
+        miles, resto = divmod(grupo, 1000)
+        if miles == 1:
+            palabras.append('mil')
+        elif miles:
+            palabras.append('%s mil' % LETRAS_APOCOPE[miles])
+        if resto:
+            palabras.append(
+                (LETRAS_APOCOPE if (escala or apocope) else LETRAS)[resto])
+        if escala:
+            palabras.append(SCALES[escala][grupo != 1])
+    return ' '.join(palabras)
+
+
+# Compatibilidad: nombres anteriores, hoy resueltos por leer_entero().
 def leer_miles(numero):
-    millar, centena = divmod(numero, 1000)
-    resultado = ''
-    if (millar == 1):
-        resultado = ''
-    if (millar >= 2) and (millar <= 9):
-        resultado = UNIDADES[millar]
-    elif (millar >= 10) and (millar <= 99):
-        resultado = leer_decenas(millar)
-    elif (millar >= 100) and (millar <= 999):
-        resultado = leer_centenas(millar)
-    resultado = '%s mil' % resultado
-    if centena > 0:
-        resultado = '%s %s' % (resultado, leer_centenas(centena))
-    return resultado
+    return leer_entero(numero)
+
 
 def leer_millones(numero):
-    millon, millar = divmod(numero, 1000000)
-    resultado = ''
-    if (millon == 1):
-        resultado = ' un millon '
-    if (millon >= 2) and (millon <= 9):
-        resultado = UNIDADES[millon]
-    elif (millon >= 10) and (millon <= 99):
-        resultado = leer_decenas(millon)
-    elif (millon >= 100) and (millon <= 999):
-        resultado = leer_centenas(millon)
-    if millon > 1:
-        resultado = '%s millones' % resultado
-    if (millar > 0) and (millar <= 999):
-        resultado = '%s %s' % (resultado, leer_centenas(millar))
-    elif (millar >= 1000) and (millar <= 999999):
-        resultado = '%s %s' % (resultado, leer_miles(millar))
-    return resultado
+    return leer_entero(numero)
+
 
 def leer_millardos(numero):
-    millardo, millon = divmod(numero, 1000000)
-    return '%s millones %s' % (leer_miles(millardo), leer_millones(millon))
+    return leer_entero(numero)
+
+
+def _get_partes(numero):
+    """
+    Obtiene (negativo, entero, centavos) del número, redondeado a dos
+    decimales (ROUND_HALF_UP). Los float se convierten mediante su texto
+    para que 1.005 se redondee a 1.01 y no a 1.00.
+    """
+    if isinstance(numero, int):
+        return numero < 0, abs(numero), 0
+    if not isinstance(numero, Decimal):
+        numero = Decimal(str(numero))
+    negativo = numero < 0
+    numero = abs(numero)
+    if numero > MAX_NUMERO:
+        raise OverflowError('Número demasiado alto')
+    centavos = int(numero.quantize(CENTAVO, ROUND_HALF_UP) * 100)
+    entero, centavos = divmod(centavos, 100)
+    return negativo and bool(entero or centavos), entero, centavos
 
 
+def numero_a_letras(numero):
+    negativo, entero, centavos = _get_partes(numero)
+    resultado = leer_entero(entero)
+    if centavos > 9:
+        resultado = '%s punto %s' % (resultado, LETRAS[centavos])
+    elif centavos > 0:
+        resultado = '%s punto cero %s' % (resultado, LETRAS[centavos])
+    if negativo:
+        return 'menos %s' % resultado
+    return resultado
 
 
-    
\ No newline at end of file
+def numero_a_moneda(numero, moneda="pesos"):
+    if not moneda:
+        moneda = MONEDA_PLURAL
+    moneda = moneda.lower()
+    negativo, entero, centavos = _get_partes(numero)
+    if centavos == 1:
+        centimos = CENTIMOS_SINGULAR
+    else:
+        centimos = CENTIMOS_PLURAL
+    letras = '%s %s con %s %s' % (leer_entero(entero, apocope=True), moneda,
+        LETRAS_APOCOPE[centavos], centimos)
+    if negativo:
+        return 'menos %s' % letras
+    return letras
+
+
+def numeros_a_letras(numeros):
+    """
+    Igual que numero_a_letras() para una lista de números (Ej. los totales
+    de un lote de facturas).
+    """
+    return [numero_a_letras(numero) for numero in numeros]
+
+
+def numeros_a_moneda(numeros, moneda="pesos"):
+    """Igual que numero_a_moneda() para una lista de números."""
+    if not moneda:
+        moneda = MONEDA_PLURAL
+    moneda = moneda.lower()
+    return [numero_a_moneda(numero, moneda) for numero in numeros]
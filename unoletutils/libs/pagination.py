@@ -0,0 +1,366 @@
+"""
+Herramientas de paginación para listados con grandes volúmenes de datos.
+"""
+
+import base64
+import binascii
+import datetime
+import functools
+import hashlib
+import json
+import operator
+
+from django.core.cache import caches
+from django.core.exceptions import (EmptyResultSet, FieldDoesNotExist, 
+    ValidationError)
+from django.core.paginator import Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, models
+from django.db.models import Q
+from django.db.models.constants import LOOKUP_SEP
+from django.utils.functional import cached_property
+
+
+# Estrategias para obtener el total de registros de un listado.
+COUNT_EXACT = "exact"
+COUNT_CACHED = "cached"
+COUNT_APPROXIMATE = "approximate"
+COUNT_STRATEGIES = (COUNT_EXACT, COUNT_CACHED, COUNT_APPROXIMATE)
+
+
+class PaginationError(Exception):
+    pass
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """
+    Igual que DjangoJSONEncoder pero conserva los microsegundos, de lo
+    contrario el cursor no apuntaría exactamente a la última fila.
+    """
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+def encode_cursor(values, reverse: bool=False) -> str:
+    """
+    Obtiene un token opaco a partir de los valores de ordenamiento de una fila.
+
+    Parameters:
+        values (list): valores de los campos de ordenamiento de la fila.
+        reverse (bool): si es True, el token apunta a la página anterior.
+    """
+    data = json.dumps({"v": list(values), "r": bool(reverse)},
+        cls=CursorEncoder, separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> tuple:
+    """
+    Obtiene los valores y la dirección (values, reverse) del token indicado.
+    Lanza PaginationError si el token no es válido.
+    """
+    try:
+        token = str(token)
+        data = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        data = json.loads(data.decode("utf-8"))
+        return list(data["v"]), bool(data["r"])
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError,
+        TypeError) as e:
+        raise PaginationError(f"El cursor '{token}' no es válido.") from e
+
+
+def get_cursor_ordering(ordering) -> tuple:
+    """
+    Normaliza el orden indicado asegurando que termine en un campo único (pk),
+    de lo contrario dos filas con los mismos valores podrían saltarse.
+    """
+    if isinstance(ordering, str):
+        ordering = (ordering,)
+    ordering = tuple(ordering)
+    if not ordering or ordering[-1].lstrip("-") not in ("pk", "id"):
+        ordering += ("pk",)
+    return ordering
+
+
+def get_cursor_values(obj, ordering) -> list:
+    """Obtiene los valores de los campos de ordenamiento del objeto."""
+    values = []
+    for field in ordering:
+        value = obj
+        for name in field.lstrip("-").split("__"):
+            value = getattr(value, name)
+        if isinstance(value, models.Model):
+            value = value.pk
+        values.append(value)
+    return values
+
+
+def get_ordering_field(model, name: str):
+    """
+    Obtiene el campo del modelo correspondiente al campo de ordenamiento
+    indicado (Ej. '-document__date') o None si no es un campo del modelo
+    (Ej. una anotación).
+    """
+    opts = model._meta
+    field = None
+    for part in name.lstrip("-").split(LOOKUP_SEP):
+        if field is not None:
+            if not field.is_relation:
+                return None
+            opts = field.related_model._meta
+        if part == "pk":
+            field = opts.pk
+            continue
+        try:
+            field = opts.get_field(part)
+        except (FieldDoesNotExist):
+            return None
+    return field
+
+
+def clean_cursor_values(model, ordering, values) -> list:
+    """
+    Convierte los valores del cursor al tipo de cada campo de ordenamiento.
+    Lanza PaginationError si algún valor no es válido, ya que el cursor
+    proviene de la petición y puede haber sido alterado.
+    """
+    if len(ordering) != len(values):
+        raise PaginationError("El cursor no corresponde con el orden actual.")
+    out = []
+    for (name, value) in zip(ordering, values):
+        field = get_ordering_field(model, name)
+        if field is not None and value is not None:
+            try:
+                value = field.to_python(value)
+            except (ValidationError, ValueError, TypeError) as e:
+                raise PaginationError(f"El cursor contiene un valor no válido "
+                    f"para '{name.lstrip('-')}'.") from e
+        out.append(value)
+    return out
+
+
+def reverse_ordering(ordering) -> tuple:
+    """Invierte la dirección de cada campo de ordenamiento."""
+    return tuple(f[1:] if f.startswith("-") else f"-{f}" for f in ordering)
+
+
+def keyset_q(ordering, values) -> Q:
+    """
+    Obtiene el filtro Q que selecciona las filas posteriores a 'values' según
+    el orden indicado. Para ('-date', 'pk') equivale a:
+        (date < v0) OR (date = v0 AND pk > v1)
+    """
+    if len(ordering) != len(values):
+        raise PaginationError("El cursor no corresponde con el orden actual.")
+    clauses = []
+    for i, field in enumerate(ordering):
+        lookup = "lt" if field.startswith("-") else "gt"
+        filters = {ordering[j].lstrip("-"): values[j] for j in range(i)}
+        filters[f"{field.lstrip('-')}__{lookup}"] = values[i]
+        clauses.append(Q(**filters))
+    return functools.reduce(operator.or_, clauses)
+
+
+class CursorPage:
+    """
+    Página obtenida mediante paginación por cursor (keyset).
+
+    No conoce el total de registros ni su número de página, solo si existen
+    páginas anteriores o siguientes y los tokens para acceder a ellas.
+    """
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f"<CursorPage next={self.next_cursor} previous={self.previous_cursor}>"
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+def _get_cursor_queryset(queryset, ordering, cursor):
+    ordering = get_cursor_ordering(ordering)
+    values, reverse = decode_cursor(cursor) if cursor else (None, False)
+    order = reverse_ordering(ordering) if reverse else ordering
+    queryset = queryset.order_by(*order)
+    if values is not None:
+        values = clean_cursor_values(queryset.model, order, values)
+        queryset = queryset.filter(keyset_q(order, values))
+    return queryset, ordering, values, reverse
+
+
+def _get_cursor_page(rows, page_size, ordering, values, reverse) -> CursorPage:
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if reverse:
+        rows.reverse()
+
+    if reverse:
+        has_next, has_previous = True, has_more
+    else:
+        has_next, has_previous = has_more, values is not None
+
+    next_cursor = previous_cursor = None
+    if rows and has_next:
+        next_cursor = encode_cursor(get_cursor_values(rows[-1], ordering))
+    if rows and has_previous:
+        previous_cursor = encode_cursor(
+            get_cursor_values(rows[0], ordering), reverse=True)
+    return CursorPage(rows, next_cursor, previous_cursor)
+
+
+def paginate_by_cursor(queryset, ordering, page_size: int,
+    cursor: str=None) -> CursorPage:
+    """
+    Pagina el queryset sobre el orden indicado sin utilizar OFFSET ni COUNT(*),
+    por lo que el costo de cualquier página es el mismo que el de la primera.
+
+    Parameters:
+        queryset (QuerySet): queryset a paginar.
+        ordering (iter): campos de ordenamiento, preferiblemente indexados.
+            Ej. ('-date', 'pk').
+        page_size (int): cantidad de registros por página.
+        cursor (str): token obtenido de una página anterior (opcional).
+    """
+    queryset, ordering, values, reverse = _get_cursor_queryset(queryset, 
+        ordering, cursor)
+    # Obtenemos un registro extra para saber si hay más páginas.
+    rows = list(queryset[:page_size + 1])
+    return _get_cursor_page(rows, page_size, ordering, values, reverse)
+
+
+async def apaginate_by_cursor(queryset, ordering, page_size: int,
+    cursor: str=None) -> CursorPage:
+    """Igual que paginate_by_cursor() utilizando el ORM asíncrono."""
+    queryset, ordering, values, reverse = _get_cursor_queryset(queryset, 
+        ordering, cursor)
+    rows = [obj async for obj in queryset[:page_size + 1]]
+    return _get_cursor_page(rows, page_size, ordering, values, reverse)
+
+
+def _signature_value(value):
+    if isinstance(value, models.Model):
+        return value.pk
+    if isinstance(value, (models.QuerySet, list, tuple, set)):
+        return sorted(str(_signature_value(v)) for v in value)
+    return str(value)
+
+
+def get_filter_signature(data: dict) -> str:
+    """
+    Obtiene una firma corta de los filtros indicados (Ej. form.cleaned_data).
+    Los valores vacíos se omiten, ya que no filtran el queryset.
+    """
+    items = sorted((k, _signature_value(v)) for (k, v) in (data or {}).items()
+        if v not in ("", None))
+    return hashlib.md5(json.dumps(items).encode("utf-8")).hexdigest()
+
+
+def get_queryset_signature(queryset) -> str:
+    """
+    Obtiene una firma corta de la consulta SQL del queryset, de manera que dos
+    querysets del mismo modelo con distintos filtros base no compartan total.
+    """
+    try:
+        sql = str(queryset.query)
+    except (EmptyResultSet):
+        sql = ""
+    return hashlib.md5(sql.encode("utf-8")).hexdigest()
+
+
+def cached_count(queryset, key: str, timeout: int=60, 
+    cache_alias: str="default") -> int:
+    """Obtiene el total de registros del queryset guardándolo en la caché."""
+    cache = caches[cache_alias]
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, timeout)
+    return count
+
+
+async def acached_count(queryset, key: str, timeout: int=60, 
+    cache_alias: str="default") -> int:
+    """Igual que cached_count() utilizando la caché y el ORM asíncronos."""
+    cache = caches[cache_alias]
+    count = await cache.aget(key)
+    if count is None:
+        count = await queryset.acount()
+        await cache.aset(key, count, timeout)
+    return count
+
+
+def estimate_count(queryset):
+    """
+    Obtiene el total estimado de registros del queryset desde las estadísticas
+    de la base de datos, sin recorrer la tabla.
+
+    Solo está disponible en PostgreSQL, para el resto retorna None.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def approximate_count(queryset, threshold: int=10000) -> tuple:
+    """
+    Obtiene (total, es_aproximado). Si la estimación supera el umbral indicado
+    se devuelve la estimación, de lo contrario el total exacto.
+    """
+    estimate = estimate_count(queryset)
+    if (estimate is not None) and (estimate >= threshold):
+        return estimate, True
+    return queryset.count(), False
+
+
+class CountPaginator(Paginator):
+    """
+    Paginator de Django cuyo total se obtiene mediante la función indicada en
+    'count_function', la cual debe retornar (total, es_aproximado).
+    """
+
+    def __init__(self, *args, count_function=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.count_function = count_function
+
+    @cached_property
+    def _count_info(self):
+        if self.count_function is None:
+            return super().count, False
+        return self.count_function(self.object_list)
+
+    @property
+    def count(self):
+        return self._count_info[0]
+
+    @property
+    def count_is_approximate(self):
+        return self._count_info[1]
@@ -0,0 +1,745 @@
+"""
+Renderizado de documentos PDF con WeasyPrint, dentro o fuera de la solicitud.
+
+Para renderizar fuera de la solicitud en un grupo de procesos local, indique en
+settings.py la cantidad de procesos:
+    UNOLETUTILS_PDF_WORKERS = 2
+    UNOLETUTILS_PDF_MAX_PENDING = 8 # Trabajos en cola antes de rechazar.
+    UNOLETUTILS_PDF_DEADLINE = 5 # Segundos de espera para responder en línea.
+    UNOLETUTILS_PDF_DIR = "/tmp/unoletutils-pdf" # Resultados de los trabajos.
+    UNOLETUTILS_PDF_TTL = 3600 # Segundos que se conservan los resultados.
+
+Para reutilizar los PDF ya renderizados de un mismo contenido (reimpresiones),
+indique el directorio de la caché y su tamaño máximo en bytes:
+    UNOLETUTILS_PDF_CACHE_DIR = "/var/cache/unoletutils-pdf"
+    UNOLETUTILS_PDF_CACHE_SIZE = 256 * 1024 * 1024
+
+Las hojas de estilo compartidas por todos los documentos se cargan una sola
+vez por proceso junto a la configuración de fuentes:
+    UNOLETUTILS_PDF_STYLESHEETS = ["/ruta/static/css/print.css"]
+"""
+
+import asyncio
+import collections
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.core.cache import cache as default_cache
+
+try:
+    from pypdf import PdfReader, PdfWriter
+except (ImportError):
+    PdfReader = PdfWriter = None
+
+
+logger = logging.getLogger(__name__)
+
+PENDING = "pending"
+DONE = "done"
+FAILED = "failed"
+
+
+class PDFError(Exception):
+    pass
+
+
+class PDFQueueFull(PDFError):
+    pass
+
+
+class PDFRenderer:
+    """
+    Renderizador de PDF que carga una sola vez por hilo la configuración de 
+    fuentes y las hojas de estilo compartidas, y las reutiliza en cada 
+    documento. FontConfiguration de WeasyPrint no es segura entre hilos, por
+    lo que cada hilo (Ej. sync_to_async) utiliza la suya.
+
+    Registra el tiempo (segundos) de cada etapa: 'parse' (HTML), 'layout' 
+    (maquetación) y 'write' (escritura del PDF). Los del último documento del 
+    hilo actual en 'last_timings' y los acumulados en 'timings'.
+    """
+
+    STAGES = ("parse", "layout", "write")
+
+    def __init__(self, stylesheets=()):
+        self.stylesheet_paths = list(stylesheets)
+        self.timings = dict.fromkeys(self.STAGES, 0.0)
+        self.count = 0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<PDFRenderer documents={self.count} timings={self.timings}>"
+
+    @property
+    def last_timings(self) -> dict:
+        return getattr(self._local, "timings", {})
+
+    @property
+    def font_config(self):
+        return getattr(self._local, "font_config", None)
+
+    @property
+    def stylesheets(self):
+        return getattr(self._local, "stylesheets", None)
+
+    def warm(self):
+        """
+        Carga la configuración de fuentes y las hojas de estilo del hilo 
+        actual.
+        """
+        if self.stylesheets is not None:
+            return
+        from weasyprint import CSS
+        try:
+            from weasyprint.text.fonts import FontConfiguration
+        except (ImportError):
+            from weasyprint.fonts import FontConfiguration
+        font_config = FontConfiguration()
+        self._local.stylesheets = [CSS(filename=path, font_config=font_config) 
+            for path in self.stylesheet_paths]
+        self._local.font_config = font_config
+
+    def render(self, html: str, base_url: str=None) -> bytes:
+        """Renderiza el HTML indicado y retorna el contenido del PDF."""
+        from weasyprint import HTML
+        self.warm()
+        t0 = time.perf_counter()
+        document = HTML(string=html, base_url=base_url)
+        t1 = time.perf_counter()
+        document = document.render(stylesheets=self.stylesheets, 
+            font_config=self.font_config)
+        t2 = time.perf_counter()
+        content = document.write_pdf()
+        t3 = time.perf_counter()
+        timings = {"parse": t1 - t0, "layout": t2 - t1, "write": t3 - t2}
+        self._local.timings = timings
+        with self._lock:
+            self.count += 1
+            for stage in self.STAGES:
+                self.timings[stage] += timings[stage]
+        logger.debug("PDF renderizado en %.3f s (parse %.3f, layout %.3f, "
+            "write %.3f).", t3 - t0, *timings.values())
+        return content
+
+    def render_merged(self, documents) -> bytes:
+        """
+        Renderiza varios documentos (html, base_url) en un solo PDF, uniendo 
+        las páginas de todos ellos en este mismo proceso.
+        """
+        from weasyprint import HTML
+        self.warm()
+        rendered = [HTML(string=html, base_url=base_url).render(
+            stylesheets=self.stylesheets, font_config=self.font_config) 
+            for (html, base_url) in documents]
+        if not rendered:
+            raise PDFError("No hay documentos para renderizar.")
+        pages = [page for document in rendered for page in document.pages]
+        return rendered[0].copy(pages).write_pdf()
+
+
+_renderer = None
+_available = None
+
+
+def is_available() -> bool:
+    """
+    Indica si WeasyPrint puede importarse en este proceso, con la
+    configuración de fuentes de cualquiera de sus versiones.
+    """
+    global _available
+    if _available is None:
+        try:
+            from weasyprint import HTML
+            try:
+                from weasyprint.text.fonts import FontConfiguration
+            except (ImportError):
+                from weasyprint.fonts import FontConfiguration
+        except (ImportError, OSError) as e:
+            # OSError: por lo general falta la librería 'cairo' o 'pango'.
+            logger.warning("No se puede renderizar en PDF: %s", e)
+            _available = False
+        else:
+            _available = True
+    return _available
+
+
+def get_renderer() -> PDFRenderer:
+    """Obtiene el renderizador de PDF de este proceso."""
+    global _renderer
+    if _renderer is None:
+        _renderer = PDFRenderer(getattr(settings, 
+            "UNOLETUTILS_PDF_STYLESHEETS", ()))
+    return _renderer
+
+
+def warm_renderer():
+    """
+    Prepara el renderizador de este proceso. Se ejecuta al iniciar cada 
+    proceso de la cola y puede invocarse al iniciar el servidor.
+    """
+    try:
+        get_renderer().warm()
+    except (ImportError, OSError) as e:
+        logger.warning("No se pudo preparar el renderizador de PDF: %s", e)
+
+
+def render_pdf(html: str, base_url: str=None) -> bytes:
+    """Renderiza el HTML indicado y retorna el contenido del PDF."""
+    return get_renderer().render(html, base_url)
+
+
+def _render_job(html: str, base_url: str, path: str) -> dict:
+    """Renderiza el PDF en el proceso de trabajo y lo guarda en 'path'."""
+    try:
+        data = render_pdf(html, base_url)
+    except (BaseException) as e:
+        with open(f"{path}.error", "w") as f:
+            f.write(str(e))
+        raise
+    with open(f"{path}.tmp", "wb") as f:
+        f.write(data)
+    os.replace(f"{path}.tmp", path)
+    return {"path": path, "timings": get_renderer().last_timings}
+
+
+def get_workers() -> int:
+    """Cantidad de procesos para renderizar lotes de documentos."""
+    return (getattr(settings, "UNOLETUTILS_PDF_WORKERS", 0) 
+        or os.cpu_count() or 1)
+
+
+def render_many(documents, workers: int=None, on_progress=None):
+    """
+    Renderiza concurrentemente en la cola compartida (get_batch_queue) los 
+    documentos indicados (iterable de (html, base_url)) y produce el 
+    contenido de cada PDF en el mismo orden. 'documents' puede ser un 
+    generador que renderice el HTML bajo demanda.
+
+    Parameters:
+        documents (iter): documentos (html, base_url) a renderizar.
+        workers (int): cantidad de documentos en curso a la vez es el doble
+            de este valor (opcional, por defecto los procesos de la cola).
+        on_progress (callable): se invoca con (terminados, enviados) cada vez 
+            que termina un documento.
+    """
+    return get_batch_queue().render_many(documents, 
+        window=workers * 2 if workers else None, on_progress=on_progress)
+
+
+def merge_pdfs(contents) -> bytes:
+    """Une el contenido de varios PDF en uno solo (requiere 'pypdf')."""
+    if PdfWriter is None:
+        raise PDFError("Es necesario el paquete 'pypdf' para unir documentos.")
+    writer = PdfWriter()
+    for content in contents:
+        for page in PdfReader(io.BytesIO(content)).pages:
+            writer.add_page(page)
+    out = io.BytesIO()
+    writer.write(out)
+    return out.getvalue()
+
+
+def render_merged(documents, workers: int=None, on_progress=None) -> bytes:
+    """
+    Renderiza los documentos (html, base_url) en un solo PDF. Si 'pypdf' está
+    instalado se renderizan concurrentemente y luego se unen, de lo contrario 
+    se renderizan en este proceso uniendo sus páginas con WeasyPrint.
+    """
+    if PdfWriter is not None:
+        return merge_pdfs(render_many(documents, workers, on_progress))
+    documents = list(documents)
+    content = get_renderer().render_merged(documents)
+    if on_progress is not None:
+        on_progress(len(documents), len(documents))
+    return content
+
+
+class _ZipStream:
+    """Archivo de solo escritura para producir un ZIP por partes."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def pop(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks = []
+        return data
+
+
+def stream_zip(documents, names, workers: int=None, on_progress=None):
+    """
+    Renderiza concurrentemente los documentos (html, base_url) y produce por 
+    partes un archivo ZIP con un PDF por documento, nombrados según 'names'.
+    """
+    stream = _ZipStream()
+    with zipfile.ZipFile(stream, "w", zipfile.ZIP_DEFLATED) as zf:
+        for (name, content) in zip(names, render_many(documents, workers, 
+            on_progress)):
+            zf.writestr(name, content)
+            yield stream.pop()
+    yield stream.pop()
+
+
+def get_batch_key(batch_id: str) -> str:
+    return f"unoletutils.pdf.batch.{batch_id}"
+
+
+def new_batch_id() -> str:
+    return uuid.uuid4().hex
+
+
+def set_batch_progress(batch_id: str, done: int, total: int, 
+    finished: bool=False, owner=None):
+    """
+    Guarda en la caché el progreso de un lote para poder consultarlo. Solo el
+    propietario indicado (pk del usuario) podrá consultarlo.
+    """
+    default_cache.set(get_batch_key(batch_id), {"done": done, "total": total, 
+        "finished": finished, "owner": owner}, 3600)
+
+
+def get_batch_progress(batch_id: str):
+    """
+    Obtiene el progreso {'done', 'total', 'finished', 'owner'} de un lote o
+    None.
+    """
+    return default_cache.get(get_batch_key(batch_id))
+
+
+class PDFQueue:
+    """
+    Cola de renderizado de PDF sobre un grupo de procesos local.
+
+    La concurrencia está limitada por 'workers' y la cola por 'max_pending'; al
+    superarse se lanza PDFQueueFull. Los resultados y el estado de cada trabajo
+    se guardan en 'directory', por lo que cualquier proceso del servidor puede
+    responder a la consulta de un trabajo.
+    """
+
+    def __init__(self, workers: int=2, max_pending: int=None,
+        directory: str=None, ttl: int=3600):
+        self.workers = workers
+        self.max_pending = max_pending or workers * 4
+        self.directory = directory or os.path.join(tempfile.gettempdir(),
+            "unoletutils-pdf")
+        self.ttl = ttl
+        self._executor = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._futures = {}
+        self._last_cleanup = 0
+
+    def __repr__(self):
+        return (f"<PDFQueue workers={self.workers} pending={len(self._futures)}"
+            f"/{self.max_pending}>")
+
+    @property
+    def executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, 
+                    initializer=warm_renderer)
+            return self._executor
+
+    def get_path(self, job_id: str) -> str:
+        if not re.fullmatch(r"[0-9a-f]{32}", str(job_id)):
+            raise PDFError(f"El trabajo '{job_id}' no es válido.")
+        return os.path.join(self.directory, f"{job_id}.pdf")
+
+    def submit(self, html: str, base_url: str=None, owner=None,
+        cache_key: str=None) -> str:
+        """
+        Agrega un trabajo a la cola y retorna su identificador.
+        Lanza PDFQueueFull si la cola está llena.
+        """
+        if not self._slots.acquire(blocking=False):
+            raise PDFQueueFull("Hay demasiados documentos en cola, intente "
+                "nuevamente en unos segundos.")
+        job_id = uuid.uuid4().hex
+        path = self.get_path(job_id)
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(f"{path}.json", "w") as f:
+                json.dump({"owner": owner, "created": time.time(),
+                    "cache_key": cache_key}, f)
+            executor, future = self._submit(_render_job, html, base_url, path)
+        except (BaseException):
+            self._slots.release()
+            raise
+        self._futures[job_id] = future
+        future.add_done_callback(lambda f: self._done(job_id, f, executor))
+        self.cleanup()
+        return job_id
+
+    def _submit(self, function, *args) -> tuple:
+        """
+        Envía la función al grupo de procesos y retorna (executor, future).
+        Si el grupo se rompió (un proceso terminó inesperadamente) se crea
+        uno nuevo.
+        """
+        executor = self.executor
+        try:
+            return executor, executor.submit(function, *args)
+        except (BrokenProcessPool):
+            self._reset_executor(executor)
+            executor = self.executor
+            return executor, executor.submit(function, *args)
+
+    def _reset_executor(self, executor):
+        """Descarta el grupo de procesos indicado si es el actual."""
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+        executor.shutdown(wait=False)
+
+    def render_many(self, documents, window: int=None, on_progress=None):
+        """
+        Renderiza los documentos (html, base_url) en los procesos de la cola
+        y produce el contenido de cada PDF en el mismo orden. Se mantienen en
+        curso hasta 'window' documentos (por defecto el doble de procesos).
+
+        Cada documento ocupa un lugar de la cola mientras se renderiza. Si la
+        cola está llena se espera a que se libere un lugar, en lugar de
+        lanzar PDFQueueFull como submit().
+        """
+        window = window or self.workers * 2
+        documents = iter(documents)
+        pending = collections.deque()
+        done = sent = 0
+        try:
+            while True:
+                while len(pending) < window:
+                    try:
+                        html, base_url = next(documents)
+                    except (StopIteration):
+                        break
+                    self._slots.acquire()
+                    try:
+                        executor, future = self._submit(render_pdf, html, 
+                            base_url)
+                    except (BaseException):
+                        self._slots.release()
+                        raise
+                    future.add_done_callback(
+                        lambda f, executor=executor: self._batch_done(f, executor))
+                    pending.append(future)
+                    sent += 1
+                if not pending:
+                    break
+                content = pending.popleft().result()
+                done += 1
+                if on_progress is not None:
+                    on_progress(done, sent)
+                yield content
+        finally:
+            # Si se interrumpe el lote (Ej. el cliente cerró la conexión),
+            # se descartan los documentos aún no iniciados.
+            for future in pending:
+                future.cancel()
+
+    def _batch_done(self, future, executor):
+        self._slots.release()
+        if (not future.cancelled() and 
+            isinstance(future.exception(), BrokenProcessPool)):
+            self._reset_executor(executor)
+
+    def _done(self, job_id, future, executor=None):
+        self._futures.pop(job_id, None)
+        self._slots.release()
+        if future.cancelled():
+            error = PDFError("El trabajo fue cancelado.")
+        else:
+            error = future.exception()
+        if error is not None:
+            logger.error("Error renderizando el PDF %s: %s", job_id, error)
+            self._set_failed(job_id, error)
+            if isinstance(error, BrokenProcessPool):
+                self._reset_executor(executor)
+        else:
+            logger.debug("PDF %s renderizado %s.", job_id, 
+                future.result()["timings"])
+
+    def _set_failed(self, job_id: str, error):
+        """
+        Marca el trabajo como fallido si _render_job no llegó a hacerlo (Ej.
+        el proceso murió), de lo contrario quedaría pendiente para siempre.
+        """
+        path = self.get_path(job_id)
+        if os.path.exists(f"{path}.error"):
+            return
+        try:
+            with open(f"{path}.error", "w") as f:
+                f.write(str(error) or error.__class__.__name__)
+        except (OSError):
+            pass
+
+    def wait(self, job_id: str, timeout: float) -> bool:
+        """Espera hasta 'timeout' segundos a que el trabajo termine."""
+        future = self._futures.get(job_id)
+        if future is not None:
+            try:
+                future.result(timeout=timeout)
+            except (FutureTimeoutError):
+                return False
+            except (BaseException) as e:
+                self._set_failed(job_id, e)
+        return self.get_status(job_id) in (DONE, FAILED)
+
+    async def await_job(self, job_id: str, timeout: float) -> bool:
+        """Igual que wait() sin bloquear el bucle de eventos."""
+        future = self._futures.get(job_id)
+        if future is not None:
+            try:
+                # shield() evita que al vencer el plazo se cancele el trabajo.
+                await asyncio.wait_for(asyncio.shield(
+                    asyncio.wrap_future(future)), timeout)
+            except (asyncio.TimeoutError):
+                return False
+            except (Exception) as e:
+                self._set_failed(job_id, e)
+        return self.get_status(job_id) in (DONE, FAILED)
+
+    def get_status(self, job_id: str):
+        """Obtiene el estado del trabajo o None si no existe."""
+        path = self.get_path(job_id)
+        if os.path.exists(path):
+            return DONE
+        if os.path.exists(f"{path}.error"):
+            return FAILED
+        if os.path.exists(f"{path}.json"):
+            return PENDING
+        return None
+
+    def get_info(self, job_id: str) -> dict:
+        """Obtiene los datos indicados al agregar el trabajo."""
+        try:
+            with open(f"{self.get_path(job_id)}.json", "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def get_owner(self, job_id: str):
+        """Obtiene el propietario indicado al agregar el trabajo."""
+        return self.get_info(job_id).get("owner")
+
+    def get_error(self, job_id: str) -> str:
+        try:
+            with open(f"{self.get_path(job_id)}.error", "r") as f:
+                return f.read()
+        except (OSError):
+            return ""
+
+    def read(self, job_id: str) -> bytes:
+        """Obtiene el contenido del PDF de un trabajo terminado."""
+        with open(self.get_path(job_id), "rb") as f:
+            return f.read()
+
+    def delete(self, job_id: str):
+        """Elimina los archivos del trabajo."""
+        path = self.get_path(job_id)
+        for name in (path, f"{path}.json", f"{path}.error", f"{path}.tmp"):
+            try:
+                os.remove(name)
+            except (FileNotFoundError):
+                pass
+
+    def cleanup(self, force: bool=False):
+        """Elimina los archivos de los trabajos con más de 'ttl' segundos."""
+        now = time.time()
+        if not force and now - self._last_cleanup < 60:
+            return
+        self._last_cleanup = now
+        try:
+            entries = list(os.scandir(self.directory))
+        except (FileNotFoundError):
+            return
+        for entry in entries:
+            try:
+                if now - entry.stat().st_mtime > self.ttl:
+                    os.remove(entry.path)
+            except (OSError):
+                pass
+
+    def shutdown(self, wait: bool=True):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
+
+
+class PDFCache:
+    """
+    Caché en disco de PDF renderizados, direccionada por el contenido.
+
+    La clave es el hash del HTML junto al nombre de la plantilla y la url base,
+    por lo que un documento sin cambios reutiliza el PDF ya renderizado. Al
+    superarse 'max_size' bytes se eliminan los menos usados recientemente.
+    """
+    # Segundos tras los cuales un archivo temporal (*.tmp) se considera 
+    # abandonado, Ej. por un proceso terminado mientras lo escribía.
+    tmp_grace_period = 3600
+
+    def __init__(self, directory: str, max_size: int=256 * 1024 * 1024):
+        self.directory = directory
+        self.max_size = max_size
+
+    def __repr__(self):
+        return f"<PDFCache {self.directory} max_size={self.max_size}>"
+
+    @staticmethod
+    def get_key(html: str, template_name: str=None, base_url: str=None) -> str:
+        h = hashlib.sha256()
+        for value in (template_name, base_url, html):
+            h.update(str(value or "").encode("utf-8"))
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def get_path(self, key: str) -> str:
+        if not re.fullmatch(r"[0-9a-f]{64}", str(key)):
+            raise PDFError(f"La clave '{key}' no es válida.")
+        return os.path.join(self.directory, f"{key}.pdf")
+
+    def open(self, key: str):
+        """
+        Obtiene el archivo (abierto en modo binario) del PDF con la clave 
+        indicada o None si no está en la caché.
+        """
+        path = self.get_path(key)
+        try:
+            f = open(path, "rb")
+        except (FileNotFoundError):
+            return None
+        # La fecha de modificación marca el último uso (LRU).
+        try:
+            os.utime(path)
+        except (OSError):
+            pass
+        return f
+
+    def set(self, key: str, content: bytes):
+        """Guarda el contenido del PDF con la clave indicada."""
+        path = self.get_path(key)
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(content)
+        os.replace(tmp, path)
+        self.evict()
+
+    def evict(self):
+        """
+        Elimina los PDF menos usados hasta no superar 'max_size' bytes. Los
+        archivos temporales que otro proceso puede estar escribiendo no se 
+        tocan, solo los abandonados hace más de 'tmp_grace_period' segundos.
+        """
+        files = []
+        total = 0
+        now = time.time()
+        for entry in os.scandir(self.directory):
+            try:
+                stat = entry.stat()
+            except (OSError):
+                continue
+            if entry.name.endswith(".tmp"):
+                if now - stat.st_mtime > self.tmp_grace_period:
+                    try:
+                        os.remove(entry.path)
+                    except (OSError):
+                        pass
+                continue
+            files.append((stat.st_mtime, stat.st_size, entry.path))
+            total += stat.st_size
+        files.sort()
+        for (mtime, size, path) in files:
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except (OSError):
+                continue
+            total -= size
+
+    def clear(self):
+        for entry in os.scandir(self.directory):
+            try:
+                os.remove(entry.path)
+            except (OSError):
+                pass
+
+
+_queue = None
+_cache = None
+_batch_queue = None
+_batch_lock = threading.Lock()
+
+
+def get_queue():
+    """
+    Obtiene la cola de renderizado configurada en settings.py o None si se
+    debe renderizar dentro de la solicitud (UNOLETUTILS_PDF_WORKERS = 0).
+    """
+    global _queue
+    workers = getattr(settings, "UNOLETUTILS_PDF_WORKERS", 0)
+    if not workers:
+        return None
+    if _queue is None:
+        _queue = PDFQueue(workers=workers,
+            max_pending=getattr(settings, "UNOLETUTILS_PDF_MAX_PENDING", None),
+            directory=getattr(settings, "UNOLETUTILS_PDF_DIR", None),
+            ttl=getattr(settings, "UNOLETUTILS_PDF_TTL", 3600))
+    return _queue
+
+
+def get_batch_queue() -> PDFQueue:
+    """
+    Obtiene la cola en la que se renderizan los lotes de documentos: la cola
+    configurada en settings.py o, si no se configuró, una cola compartida por
+    todo el proceso con get_workers() procesos.
+    """
+    global _batch_queue
+    queue = get_queue()
+    if queue is not None:
+        return queue
+    with _batch_lock:
+        if _batch_queue is None:
+            _batch_queue = PDFQueue(workers=get_workers())
+    return _batch_queue
+
+
+def get_deadline() -> float:
+    """Segundos que se esperará un trabajo antes de responder con su estado."""
+    return getattr(settings, "UNOLETUTILS_PDF_DEADLINE", 5)
+
+
+def get_cache():
+    """Obtiene la caché de PDF configurada en settings.py o None."""
+    global _cache
+    directory = getattr(settings, "UNOLETUTILS_PDF_CACHE_DIR", None)
+    if not directory:
+        return None
+    if (_cache is None) or (_cache.directory != directory):
+        _cache = PDFCache(directory, max_size=getattr(settings,
+            "UNOLETUTILS_PDF_CACHE_SIZE", 256 * 1024 * 1024))
+    return _cache
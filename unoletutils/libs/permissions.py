@@ -0,0 +1,230 @@
+"""
+Caché entre solicitudes de los permisos y grupos de los usuarios por empresa.
+
+Se activa indicando en settings.py el alias de la caché a utilizar:
+    UNOLETUTILS_PERMISSION_CACHE = "default"
+    UNOLETUTILS_PERMISSION_CACHE_TIMEOUT = 300 # Opcional.
+
+Al cambiar las membresías o los permisos de los grupos de una empresa debe
+renovarse su versión con bump_version(company), o conectando los modelos
+involucrados mediante connect_invalidation(Membership, Group, ...).
+"""
+
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+
+PREFIX = "unoletutils.permissions"
+
+
+def new_version() -> str:
+    return uuid.uuid4().hex
+
+
+class PermissionEntry:
+    """
+    Permisos, grupos y comprobaciones de permisos de un usuario en una empresa.
+    Los valores no presentes se consultan al usuario y se guardan en la caché.
+    """
+
+    def __init__(self, cache, key, user, company, version, data=None):
+        self.cache = cache
+        self.key = key
+        self.user = user
+        self.company = company
+        self.version = version
+        self.data = data or {}
+
+    def __repr__(self):
+        return f"<PermissionEntry {self.key} {list(self.data)}>"
+
+    def _get(self, name, function, *args, **kwargs):
+        try:
+            return self.data[name]
+        except (KeyError):
+            pass
+        value = self.data[name] = function(*args, **kwargs)
+        self.save()
+        return value
+
+    async def _aget(self, name, function, *args, **kwargs):
+        try:
+            return self.data[name]
+        except (KeyError):
+            pass
+        # asgiref solo es requerido por las vistas asíncronas (Django 3.0+).
+        from asgiref.sync import sync_to_async
+        value = self.data[name] = await sync_to_async(function)(*args, **kwargs)
+        await self.asave()
+        return value
+
+    def save(self):
+        self.cache.set_entry(self.key, self.version, self.data)
+
+    async def asave(self):
+        await self.cache.aset_entry(self.key, self.version, self.data)
+
+    def get_permissions(self):
+        return self._get("permissions", self.user.get_company_permissions,
+            self.company)
+
+    def get_groups(self):
+        return self._get("groups", self.user.get_company_groups, self.company)
+
+    def has_permission(self, permission) -> bool:
+        key = permission if isinstance(permission, str) else tuple(permission)
+        return self._get(("permission", key), self.user.has_company_permission,
+            company=self.company, permission=permission)
+
+    async def aget_permissions(self):
+        return await self._aget("permissions", 
+            self.user.get_company_permissions, self.company)
+
+    async def aget_groups(self):
+        return await self._aget("groups", self.user.get_company_groups, 
+            self.company)
+
+    async def ahas_permission(self, permission) -> bool:
+        key = permission if isinstance(permission, str) else tuple(permission)
+        return await self._aget(("permission", key), 
+            self.user.has_company_permission, company=self.company, 
+            permission=permission)
+
+
+class PermissionCache:
+    """
+    Caché de permisos por (usuario, empresa, versión de permisos) sobre el
+    framework de caché de Django. Obtener la entrada de un usuario cuesta una
+    sola consulta a la caché (get_many de la versión y la entrada).
+
+    Parameters:
+        cache (str|BaseCache): alias de la caché o instancia de la misma.
+        timeout (int): segundos que se mantendrán las entradas.
+    """
+
+    def __init__(self, cache="default", timeout: int=300):
+        self.alias = cache if isinstance(cache, str) else None
+        self._cache = cache
+        self.timeout = timeout
+
+    @property
+    def cache(self):
+        if isinstance(self._cache, str):
+            self._cache = caches[self._cache]
+        return self._cache
+
+    def get_version_key(self, company) -> str:
+        return f"{PREFIX}.version.{getattr(company, 'pk', company)}"
+
+    def get_entry_key(self, user, company) -> str:
+        return (f"{PREFIX}.entry.{getattr(user, 'pk', user)}."
+            f"{getattr(company, 'pk', company)}")
+
+    def get(self, user, company) -> PermissionEntry:
+        """Obtiene la entrada de permisos del usuario en la empresa."""
+        version_key = self.get_version_key(company)
+        key = self.get_entry_key(user, company)
+        values = self.cache.get_many([version_key, key])
+        version = values.get(version_key)
+        if version is None:
+            # Sin versión no podemos confiar en ninguna entrada existente.
+            version = new_version()
+            if not self.cache.add(version_key, version, None):
+                version = self.cache.get(version_key) or version
+        return self._get_entry(key, user, company, version, values.get(key))
+
+    async def aget(self, user, company) -> PermissionEntry:
+        """Igual que get() utilizando los métodos asíncronos de la caché."""
+        version_key = self.get_version_key(company)
+        key = self.get_entry_key(user, company)
+        values = await self.cache.aget_many([version_key, key])
+        version = values.get(version_key)
+        if version is None:
+            version = new_version()
+            if not await self.cache.aadd(version_key, version, None):
+                version = await self.cache.aget(version_key) or version
+        return self._get_entry(key, user, company, version, values.get(key))
+
+    def _get_entry(self, key, user, company, version, data) -> PermissionEntry:
+        if not data or data.get("version") != version:
+            data = {}
+        else:
+            data = data["data"]
+        return PermissionEntry(self, key, user, company, version, data)
+
+    def set_entry(self, key, version, data):
+        self.cache.set(key, {"version": version, "data": data}, self.timeout)
+
+    async def aset_entry(self, key, version, data):
+        await self.cache.aset(key, {"version": version, "data": data}, 
+            self.timeout)
+
+    def bump_version(self, company):
+        """Invalida todas las entradas de permisos de la empresa."""
+        self.cache.set(self.get_version_key(company), new_version(), None)
+
+
+class LocalPermissionCache(PermissionCache):
+    """PermissionCache en memoria local, independiente de settings.CACHES."""
+
+    def __init__(self, timeout: int=300):
+        super().__init__(LocMemCache(PREFIX, {}), timeout=timeout)
+
+
+_permission_cache = None
+
+
+def get_permission_cache():
+    """
+    Obtiene la caché de permisos configurada en settings.py o None si no se
+    ha configurado.
+    """
+    global _permission_cache
+    alias = getattr(settings, "UNOLETUTILS_PERMISSION_CACHE", None)
+    if not alias:
+        return None
+    if (_permission_cache is None) or (_permission_cache.alias != alias):
+        _permission_cache = PermissionCache(alias, timeout=getattr(settings,
+            "UNOLETUTILS_PERMISSION_CACHE_TIMEOUT", 300))
+    return _permission_cache
+
+
+def bump_version(company, cache=None):
+    """Invalida los permisos en caché de todos los usuarios de la empresa."""
+    cache = cache or get_permission_cache()
+    if cache is not None:
+        cache.bump_version(company)
+
+
+def _get_instance_company(instance):
+    try:
+        return instance.get_company()
+    except (AttributeError):
+        return getattr(instance, "company", None)
+
+
+def connect_invalidation(*models, cache=None):
+    """
+    Conecta las señales de los modelos indicados (membresías, grupos, ...) para
+    invalidar los permisos de la empresa del objeto al guardar, eliminar o
+    cambiar sus relaciones muchos a muchos (Ej. los permisos de un grupo).
+    """
+    def handler(sender, instance, **kwargs):
+        action = kwargs.get("action")
+        if action and not action.startswith("post_"):
+            return
+        company = _get_instance_company(instance)
+        if company is not None:
+            bump_version(company, cache=cache)
+
+    for model in models:
+        post_save.connect(handler, sender=model, weak=False)
+        post_delete.connect(handler, sender=model, weak=False)
+        for field in model._meta.many_to_many:
+            m2m_changed.connect(handler, sender=field.remote_field.through,
+                weak=False)
+    return handler
@@ -0,0 +1,180 @@
+"""
+Renderizado directo a HTML de las tablas de los listados (BaseList), sin pasar
+por el motor de plantillas en cada celda.
+
+Las columnas de 'list_display', sus clases css y enlaces se compilan una sola
+vez en un TableRenderer, que escribe el HTML escapado de cada fila en un
+buffer. El resto de la página se renderiza con la plantilla, Ej. {{ table }}.
+"""
+
+import io
+
+from django.db import models
+from django.utils import formats
+from django.utils.html import conditional_escape, escape
+from django.utils.safestring import mark_safe
+from django.utils.timezone import template_localtime
+
+from unoletutils.libs.json import get_column_getter
+
+
+# Renderizadores compilados por (modelo, columnas, clases css, enlaces).
+RENDERERS = {}
+
+
+def format_value(value) -> str:
+    """
+    Obtiene el texto escapado del valor tal como lo mostraría {{ value }} en
+    una plantilla, excepto None que se muestra vacío.
+    """
+    if value is None:
+        return ""
+    if callable(value):
+        return format_value(value())
+    return conditional_escape(formats.localize(template_localtime(value)))
+
+
+def _format_text(value) -> str:
+    return "" if value is None else escape(value)
+
+
+def _format_localized(value) -> str:
+    return "" if value is None else formats.localize(value)
+
+
+def _format_datetime(value) -> str:
+    return "" if value is None else formats.localize(template_localtime(value))
+
+
+def get_cell_formatter(field):
+    """
+    Obtiene la función que convierte los valores del campo indicado en el
+    texto escapado de la celda. Los campos con opciones (choices) muestran
+    el texto de la opción.
+    """
+    if field is None or field.is_relation:
+        return format_value
+    if field.flatchoices:
+        choices = dict(field.flatchoices)
+        return lambda value: format_value(choices.get(value, value))
+    if isinstance(field, (models.CharField, models.TextField)):
+        return _format_text
+    if isinstance(field, models.DateTimeField):
+        return _format_datetime
+    # Las fechas y números localizados no contienen caracteres a escapar.
+    if isinstance(field, (models.DateField, models.TimeField,
+        models.DecimalField, models.IntegerField, models.FloatField)):
+        return _format_localized
+    return format_value
+
+
+def get_url(obj):
+    try:
+        return str(obj.get_absolute_url())
+    except (AttributeError):
+        return None
+
+
+class TableRenderer:
+    """
+    Tabla HTML de un listado compilada a partir de sus columnas.
+
+    Parameters:
+        model (Model): modelo de los objetos del listado.
+        columns (list): columnas [(nombre, etiqueta), ...] (list_display).
+        cssclass (dict): clase css de cada columna (list_display_cssclass).
+        links (iter): columnas enlazadas al objeto (list_display_links).
+        table_cssclass (str): clase css de la tabla.
+    """
+
+    def __init__(self, model, columns, cssclass=None, links=(),
+        table_cssclass: str="table"):
+        cssclass = cssclass or {}
+        self.model = model
+        self.table_cssclass = table_cssclass
+        # Las etiquetas pueden ser traducibles, se escapan al renderizar.
+        self.headers = []
+        self.cells = []
+        for (name, label) in columns:
+            css = cssclass.get(name, "")
+            attrs = f' class="{escape(css)}"' if css else ""
+            getter, field = get_column_getter(model, name)
+            self.headers.append((f"<th{attrs}>", label))
+            self.cells.append((getter, get_cell_formatter(field),
+                f"<td{attrs}>", name in links))
+
+    def __repr__(self):
+        return f"<TableRenderer {self.model.__name__} {len(self.cells)} columnas>"
+
+    def render_head(self, write):
+        write("<thead><tr>")
+        for (tag, label) in self.headers:
+            write(tag)
+            write(escape(label))
+            write("</th>")
+        write("</tr></thead>")
+
+    def render_rows(self, objects, write, get_url=get_url):
+        """Escribe en 'write' las filas <tr> de los objetos indicados."""
+        cells = self.cells
+        for obj in objects:
+            write(f'<tr data-pk="{escape(obj.pk)}">')
+            url = False
+            for (getter, formatter, tag, is_link) in cells:
+                value = formatter(getter(obj))
+                if is_link:
+                    if url is False:
+                        url = get_url(obj)
+                    if url:
+                        value = f'<a href="{escape(url)}">{value}</a>'
+                write(tag)
+                write(value)
+                write("</td>")
+            write("</tr>")
+
+    def render(self, objects, get_url=get_url) -> str:
+        """Obtiene el HTML de la tabla completa con los objetos indicados."""
+        buffer = io.StringIO()
+        write = buffer.write
+        write(f'<table class="{escape(self.table_cssclass)}">')
+        self.render_head(write)
+        write("<tbody>")
+        self.render_rows(objects, write, get_url)
+        write("</tbody></table>")
+        return mark_safe(buffer.getvalue())
+
+
+class Table:
+    """
+    Tabla de un listado que se renderiza (una sola vez) al mostrarse en la
+    plantilla, Ej. {{ table }}.
+    """
+
+    def __init__(self, renderer, objects, get_url=get_url):
+        self.renderer = renderer
+        self.objects = objects
+        self.get_url = get_url
+        self._html = None
+
+    def __str__(self):
+        if self._html is None:
+            self._html = self.renderer.render(self.objects, self.get_url)
+        return self._html
+
+    def __html__(self):
+        return str(self)
+
+
+def get_table_renderer(model, columns, cssclass=None, links=(),
+    table_cssclass: str="table") -> TableRenderer:
+    """Obtiene el renderizador compilado para las columnas indicadas."""
+    cssclass = cssclass or {}
+    key = (model, tuple((e[0], e[1]) for e in columns),
+        tuple(sorted(cssclass.items())), tuple(links), table_cssclass)
+    try:
+        return RENDERERS[key]
+    except (KeyError):
+        pass
+    renderer = RENDERERS[key] = TableRenderer(model, columns, cssclass, links,
+        table_cssclass)
+    return renderer
@@ -2,17 +2,113 @@
 Módulo con herramientas útiles para el manejo de cadenas de textos.
 """
 
+import decimal
+import functools
 import re
 import unicodedata
 import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy
+except (ImportError):
+    numpy = None
 
 from . import number, number_letter
 
 
+# Los caracteres por debajo de este límite (latín, IPA y marcas diacríticas)
+# se normalizan con una tabla precalculada. El resto con unicodedata.
+NORMALIZE_TABLE_LIMIT = 0x370
+# Cantidad de textos normalizados que se recuerdan y longitud máxima de los
+# textos a recordar.
+NORMALIZE_CACHE_SIZE = 4096
+NORMALIZE_CACHE_MAX_LENGTH = 200
+# Tamaño máximo en bytes de las etiquetas de búsqueda (ModelBase.tags).
+TAGS_MAX_BYTES = 700
+# Cantidad de textos distintos a partir de la cual las funciones por lotes
+# (normalize_many, get_tags_many, ...) reparten el trabajo en procesos, y
+# cantidad de textos enviados a cada proceso por vez.
+BATCH_PROCESS_THRESHOLD = 50000
+BATCH_CHUNK_SIZE = 10000
+# Cantidad de montos en letras que se recuerdan (Text.number_to_letter).
+NUMBER_TO_LETTER_CACHE_SIZE = 2048
+
+
 class TextError(Exception):
     pass
 
 
+def _strip_marks(string: str) -> str:
+    """Descompone el texto (NFD) y elimina las marcas diacríticas (Mn)."""
+    return ''.join((c for c in unicodedata.normalize('NFD', string)
+        if unicodedata.category(c) != 'Mn'))
+
+
+def _get_normalize_table() -> dict:
+    # Por debajo del límite, todas las marcas combinables son Mn, por lo que
+    # normalizar carácter por carácter equivale a normalizar el texto.
+    table = {}
+    for i in range(NORMALIZE_TABLE_LIMIT):
+        char = _strip_marks(chr(i))
+        if char != chr(i):
+            table[i] = char
+    table[ord("'")] = None
+    table[ord('"')] = None
+    return table
+
+
+NORMALIZE_TABLE = _get_normalize_table()
+_NORMALIZE_TABLE_MAX = chr(NORMALIZE_TABLE_LIMIT - 1)
+
+
+def _normalize(string: str, lower: bool=True) -> str:
+    if string.isascii():
+        out = string.replace("'", "").replace('"', '')
+    elif max(string) <= _NORMALIZE_TABLE_MAX:
+        out = string.translate(NORMALIZE_TABLE)
+    else:
+        out = _strip_marks(string.replace("'", "").replace('"', ''))
+    out = " ".join(out.split())
+    if lower:
+        out = out.lower()
+    return out
+
+
+_normalize_cached = functools.lru_cache(maxsize=NORMALIZE_CACHE_SIZE)(_normalize)
+
+
+def _number_to_letter(number, in_moneda: bool, moneda: str) -> str:
+    if in_moneda is True:
+        return number_letter.numero_a_moneda(number, moneda=moneda)
+    return number_letter.numero_a_letras(number)
+
+
+_number_to_letter_cached = functools.lru_cache(
+    maxsize=NUMBER_TO_LETTER_CACHE_SIZE)(_number_to_letter)
+
+
+def get_number_key(number):
+    """
+    Obtiene la clave del monto para la caché de Text.number_to_letter().
+    Los montos iguales comparten la clave (Ej. 100, 100.0 y Decimal('100.00')).
+    """
+    if isinstance(number, (int, decimal.Decimal)):
+        return number
+    return decimal.Decimal(str(number))
+
+
+def number_to_letter_cache_info():
+    """Estadísticas de la caché de Text.number_to_letter() (hits, misses...)."""
+    return _number_to_letter_cached.cache_info()
+
+
+def number_to_letter_cache_clear():
+    """Vacía la caché de Text.number_to_letter()."""
+    _number_to_letter_cached.cache_clear()
+
+
 class Text(number.Number):
     """
     Realiza operaciones con textos mediante algunos métodos útiles.
@@ -21,10 +117,13 @@ class Text(number.Number):
     @classmethod
     def number_to_letter(cls, number, in_moneda: bool=True, 
         moneda: str="dop") -> str:
-        """Convierte un número en un texto leíble."""
-        if in_moneda is True:
-            return number_letter.numero_a_moneda(number, moneda=moneda)
-        return number_letter.numero_a_letras(number)
+        """
+        Convierte un número en un texto leíble. Los resultados se recuerdan
+        por (monto, in_moneda, moneda), ver number_to_letter_cache_info().
+        """
+        moneda = (moneda or number_letter.MONEDA_PLURAL).lower()
+        return _number_to_letter_cached(get_number_key(number), 
+            in_moneda is True, moneda)
 
     @classmethod
     def normalize(cls, string: str, lower: bool=True) -> str:
@@ -39,18 +138,14 @@ class Text(number.Number):
         if (string is None) or (string is False) or (string is True):
             return ""
 
-        string = str(string).replace("'", "").replace('"', '')
-
-        out = ''.join((c for c in unicodedata.normalize('NFD', string)
-            if unicodedata.category(c) != 'Mn'))
-
-        out = " ".join(out.split()).strip()
-        if lower:
-            out = out.lower()
-        return out
+        string = str(string)
+        if len(string) <= NORMALIZE_CACHE_MAX_LENGTH:
+            return _normalize_cached(string, lower)
+        return _normalize(string, lower)
 
     @classmethod
-    def get_tag(cls, text, combinate=False, allow=None) -> str:
+    def get_tag(cls, text, combinate=False, allow=None, 
+        max_bytes: int=None) -> str:
         """
         Obtiene un texto pre-formateado sin tíldes, ni comillas, ni slash...,
         ideal para campo de búsqueda.
@@ -67,6 +162,9 @@ class Text(number.Number):
             allow (str): una cadena de caracteres que le indicarán a este método
             que los caracteres que en 'allow' no se especifiquen, serán excluidos
             del resultado.
+
+            max_bytes (int): tamaño máximo del resultado combinado (ver 
+            iter_tags).
         """
         t = cls.normalize(text, lower=False)
 
@@ -77,8 +175,7 @@ class Text(number.Number):
 
             # Solo se permitirán estos caracteres.
             # El resto será excluido del resultado.
-            regexp = "[^" + allow + "]" # Expresión Regular.
-            t = re.sub(regexp, "", t)
+            t = _exclude("[^" + allow + "]", t)
 
         # De ninguna forma están permitidos estos caráctes que eliminaremos.
         # Esto es porque podría causar problemas utilizandolo dentro de otros
@@ -90,7 +187,7 @@ class Text(number.Number):
         t = t.lower()
         # Combinaciones.
         if (combinate == True):
-            return cls.permutations(t).strip()
+            return cls.build_tags(t, max_bytes=max_bytes)
         return t
 
     @classmethod
@@ -118,9 +215,13 @@ class Text(number.Number):
             allow (str): una cadena de caracteres que le indicarán a este método
             que los caracteres que en 'allow' no se especifiquen, serán 
             excluidos del resultado.
+
+            max_bytes (int): tamaño máximo del resultado combinado (ver 
+            iter_tags).
         """
         combinate = kwargs.get("combinate") or kwargs.get("comb", False)
         allow = kwargs.get("allow")
+        max_bytes = kwargs.get("max_bytes")
 
         if len(args) == 1:
             args = args[0]
@@ -131,7 +232,7 @@ class Text(number.Number):
             args = cls.normalize(args)
 
         if (combinate):
-            args = cls.permutations(args)
+            args = cls.build_tags(args, max_bytes=max_bytes)
 
         if allow:
             if not isinstance(allow, str):
@@ -140,8 +241,7 @@ class Text(number.Number):
 
             # Solo se permitirán estos caracteres.
             # El resto será excluido del resultado.
-            regexp = "[^ " + allow + "]" # Expresión Regular.
-            args = re.sub(regexp, "", args)
+            args = _exclude("[^ " + allow + "]", args)
 
         # De ninguna forma están permitidos estos caráctes que eliminaremos.
         # Esto es porque podría causar problemas utilizandolo dentro de otros
@@ -170,20 +270,74 @@ class Text(number.Number):
         if not remplace:
             remplace = ""
 
-        permited = ("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
-            "0123456789" + allowed)
-        out = ""
-
-        for char in string:
-            if not char in permited:
-                char = remplace
-            out += char
+        table, delete, chars = _get_codename_table(remplace, allowed or "", 
+            bool(lower))
+        if (table is not None) and string.isascii():
+            return string.encode("ascii").translate(table, delete).decode(
+                "ascii")
+        out = string.translate(chars)
 
         if lower:
             return out.lower()
 
         return out
 
+    @classmethod
+    def iter_tags(cls, words, max_bytes: int=None, split: str=" "):
+        """
+        Genera las etiquetas de búsqueda de las palabras indicadas, sin 
+        repetirlas y en orden de prioridad:
+
+            1. Cada palabra.
+            2. Los pares de palabras contiguas, en ambos sentidos.
+            3. El resto de pares de palabras, de las más cercanas a las más
+               lejanas.
+
+        Se detiene cuando la siguiente etiqueta (y su separador) superaría 
+        'max_bytes', por lo que el costo depende del tamaño indicado y no de 
+        la cantidad de palabras. Los prefijos de las palabras no se generan, 
+        ya que una búsqueda por contenido (icontains) ya los encuentra.
+
+        Parameters:
+            words (str|iter): texto o lista de palabras.
+            max_bytes (int): tamaño máximo en bytes (utf-8) del resultado 
+                unido por 'split'. Si es None no hay límite.
+            split (str): separador de las palabras y las etiquetas.
+        """
+        if isinstance(words, str):
+            words = words.split(split) if split != " " else words.split()
+        # Palabras sin repetir, en su orden original.
+        words = list(dict.fromkeys(w for w in words if w))
+        sizes = [len(w) if w.isascii() else len(w.encode("utf-8")) 
+            for w in words]
+        separator = len(split.encode("utf-8"))
+        used = -separator
+
+        for (word, size) in zip(words, sizes):
+            if max_bytes is not None and used + separator + size > max_bytes:
+                return
+            used += separator + size
+            yield word
+
+        count = len(words)
+        for distance in range(1, count):
+            for i in range(count - distance):
+                j = i + distance
+                size = sizes[i] + sizes[j] + separator
+                for (a, b) in ((i, j), (j, i)):
+                    if (max_bytes is not None and 
+                        used + separator + size > max_bytes):
+                        return
+                    used += separator + size
+                    yield f"{words[a]}{split}{words[b]}"
+
+    @classmethod
+    def build_tags(cls, words, max_bytes: int=TAGS_MAX_BYTES, 
+        split: str=" ") -> str:
+        """Obtiene las etiquetas de iter_tags() unidas por 'split'."""
+        return split.join(cls.iter_tags(words, max_bytes=max_bytes, 
+            split=split))
+
     @classmethod
     def permutations(cls, iterable: iter, r: int=2, split: str=" ") -> str:
         """
@@ -207,6 +361,9 @@ class Text(number.Number):
         Si en 'iterable' se especifica un string y no un iterable, se tomará
         el valor del parámetro 'split' para dividir los elementos del string.
 
+        Para las etiquetas de búsqueda utilice iter_tags() o build_tags(), que
+        no construyen todas las permutaciones.
+
         Returns:
             str: Una cadena de texto separada por el valor del parámetro 'split'.
         """
@@ -341,19 +498,11 @@ class Text(number.Number):
             div (str): divisor de dígitos.
             length (int): longitud permitida 11 (cédula), 9 (RNC), None (otros).
         """
-        text = "".join(text.split()).replace("-", "")
-        if length != None:
-            if len(text) != length:
-                raise TextError(f"La identificación debe contener "
-                f"exactamente {length} caracteres, la indicada tiene "
-                f"{len(text)} '{text}'.")
-        # Caracteres permitidos.
-        if allowed != None:
-            for c in text:
-                if not c in allowed:
-                    raise TextError(f"El caracter '{c}' no es válido. "
-                    f"Los carácteres permitos son: '{allowed}'.")
-        return f"{text[:3]}{div}{text[3:-1]}{div}{text[-1]}"
+        value, error = check_identification(text, div=div, length=length, 
+            allowed=allowed)
+        if error:
+            raise TextError(error)
+        return value
 
     @classmethod
     def validate_RNC(cls, text: str, div: str="-") -> str:
@@ -385,22 +534,236 @@ class Text(number.Number):
                 cls.clean_phone('8299259531') -> '(829) 925-9531'
                 cls.clean_phone('18299259531') -> '1 (829) 925-9531'
         """
-        if not text:
-            return ""
-        text = str(text)
-        text = "".join(text.split()).replace("-", "").replace(".", "")
-        text = text.replace("_", "").replace(",", "").replace(";", "")
-        if not text.isdigit():
-            raise TextError(f"{text} tiene caracteres no numéricos.")
-        if len(text) <= 4:
-            return text # 0000
-        elif len(text) <= 7:
-            return f"{text[:-4]}-{text[-4:]}" # 000-0000
-        elif len(text) <= 10:
-            return f"({text[:-7]}) {cls.clean_phone(text[-7:])}" # (000) 000-0000
-        elif len(text) <= 13:
-            return f"{text[:-10]} {cls.clean_phone(text[-10:])}" # 0 (000) 000-0000
-        else:
-            # Varios números separados por coma (,).
-            return (f"{cls.clean_phone(text[:-10])}, "
-                f"{cls.clean_phone(text[-10:])}")
+        value, error = check_phone(text)
+        if error:
+            raise TextError(error)
+        return value
+
+
+# Caracteres permitidos por Text.format_codename().
+CODENAME_CHARS = ("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    "0123456789")
+
+
+class _CharTable(dict):
+    """
+    Tabla para str.translate() que obtiene el reemplazo de cada carácter con
+    function(char) la primera vez que aparece y lo recuerda.
+    """
+
+    def __init__(self, function):
+        super().__init__()
+        self.function = function
+
+    def __missing__(self, key):
+        value = self[key] = self.function(chr(key))
+        return value
+
+
+@functools.lru_cache(maxsize=256)
+def _get_exclude_table(pattern: str) -> tuple:
+    """
+    Obtiene (bytes a eliminar de los textos ASCII, tabla del resto) para
+    eliminar del texto los caracteres que coinciden con la expresión 
+    indicada, Ej. '[^a-z0-9]'.
+    """
+    regex = re.compile(pattern)
+    delete = bytes(i for i in range(128) if regex.match(chr(i)))
+    return delete, _CharTable(lambda c: None if regex.match(c) else c)
+
+
+def _exclude(pattern: str, string: str) -> str:
+    delete, table = _get_exclude_table(pattern)
+    if string.isascii():
+        return string.encode("ascii").translate(None, delete).decode("ascii")
+    return string.translate(table)
+
+
+@functools.lru_cache(maxsize=256)
+def _get_codename_table(remplace: str, allowed: str, lower: bool) -> tuple:
+    """
+    Obtiene (tabla de bytes, bytes a eliminar, tabla de caracteres) para 
+    Text.format_codename(). Las tablas de bytes (textos ASCII) incluyen la 
+    conversión a minúsculas y solo existen si el reemplazo es de un carácter
+    ASCII o vacío.
+    """
+    permited = CODENAME_CHARS + allowed
+    chars = _CharTable(lambda c: c if c in permited else remplace)
+    if len(remplace) > 1 or not remplace.isascii():
+        return None, None, chars
+    table = bytearray(range(256))
+    delete = bytearray()
+    for i in range(128):
+        c = chr(i) if chr(i) in permited else remplace
+        if not c:
+            delete.append(i)
+            continue
+        table[i] = ord(c.lower() if lower else c)
+    return bytes(table), bytes(delete), chars
+
+
+DIGITS = "0123456789"
+# Caracteres que se eliminan de los números telefónicos (Text.clean_phone).
+_PHONE_STRIP = re.compile(r"[\s\-._,;]+")
+
+
+@functools.lru_cache(maxsize=64)
+def _get_disallowed_pattern(allowed: str):
+    if not allowed:
+        return re.compile(".", re.DOTALL)
+    return re.compile("[^" + re.escape(allowed) + "]")
+
+
+def check_identification(text, div: str="-", length: int=11, 
+    allowed: str=DIGITS) -> tuple:
+    """
+    Igual que Text.validate_identification() pero sin lanzar excepciones.
+    Retorna (identificación formateada, None) o (None, motivo del error).
+    """
+    # Caso común: solo dígitos y sin separadores.
+    if (len(text) == length and allowed in (DIGITS, None) and text.isascii() 
+        and text.isdigit()):
+        return f"{text[:3]}{div}{text[3:-1]}{div}{text[-1]}", None
+    text = "".join(text.split()).replace("-", "")
+    if length != None:
+        if len(text) != length:
+            return None, (f"La identificación debe contener exactamente "
+                f"{length} caracteres, la indicada tiene {len(text)} '{text}'.")
+    # Caracteres permitidos.
+    if allowed != None:
+        match = _get_disallowed_pattern(allowed).search(text)
+        if match:
+            return None, (f"El caracter '{match.group()}' no es válido. "
+                f"Los carácteres permitos son: '{allowed}'.")
+    return f"{text[:3]}{div}{text[3:-1]}{div}{text[-1]}", None
+
+
+def _format_phone(text: str) -> str:
+    # Los dígitos sobrantes de 13 son números de 10 dígitos separados por coma.
+    numbers = []
+    while len(text) > 13:
+        numbers.append(f"({text[-10:-7]}) {text[-7:-4]}-{text[-4:]}")
+        text = text[:-10]
+    if len(text) <= 4:
+        first = text # 0000
+    elif len(text) <= 7:
+        first = f"{text[:-4]}-{text[-4:]}" # 000-0000
+    elif len(text) <= 10:
+        first = f"({text[:-7]}) {text[-7:-4]}-{text[-4:]}" # (000) 000-0000
+    else:
+        # 0 (000) 000-0000
+        first = f"{text[:-10]} ({text[-10:-7]}) {text[-7:-4]}-{text[-4:]}"
+    numbers.append(first)
+    return ", ".join(reversed(numbers))
+
+
+def check_phone(text) -> tuple:
+    """
+    Igual que Text.clean_phone() pero sin lanzar excepciones.
+    Retorna (teléfono formateado, None) o (None, motivo del error).
+    """
+    if not text:
+        return "", None
+    text = str(text)
+    if len(text) == 10 and text.isdigit():
+        return f"({text[:3]}) {text[3:6]}-{text[6:]}", None
+    text = _PHONE_STRIP.sub("", text)
+    if not text.isdigit():
+        return None, f"{text} tiene caracteres no numéricos."
+    return _format_phone(text), None
+
+
+def _apply(function, values) -> list:
+    return [function(value) for value in values]
+
+
+def _apply_batch(function, values: list, workers: int=None) -> list:
+    workers = workers or os.cpu_count() or 1
+    if (len(values) < BATCH_PROCESS_THRESHOLD) or (workers == 1):
+        return _apply(function, values)
+    chunks = [values[i:i + BATCH_CHUNK_SIZE] 
+        for i in range(0, len(values), BATCH_CHUNK_SIZE)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(itertools.chain.from_iterable(
+            executor.map(_apply, itertools.repeat(function), chunks)))
+
+
+def _get_batch_key(value):
+    # Solo se agrupan textos (o filas de textos), ya que True == 1 y su 
+    # resultado no es el mismo.
+    if type(value) is str:
+        return value
+    if (isinstance(value, (list, tuple)) and 
+        all(type(v) is str for v in value)):
+        return tuple(value)
+    return None
+
+
+def map_texts(function, values, workers: int=None):
+    """
+    Aplica function(value) a cada valor indicado, una sola vez por cada valor
+    distinto. Si hay más de BATCH_PROCESS_THRESHOLD valores distintos se 
+    reparten en un grupo de procesos.
+
+    Si 'values' es un arreglo de NumPy el resultado también lo será (dtype
+    object), de lo contrario será una lista.
+
+    Parameters:
+        function (callable): función a aplicar (debe poder serializarse con 
+            pickle para utilizar procesos).
+        values (iter): lista, columna o arreglo de textos.
+        workers (int): procesos a utilizar, por defecto uno por CPU. Si es 1 
+            no se utilizarán procesos.
+    """
+    is_array = (numpy is not None) and isinstance(values, numpy.ndarray)
+    if is_array and values.dtype.kind == "U":
+        uniques, inverse = numpy.unique(values, return_inverse=True)
+        results = numpy.empty(len(uniques), dtype=object)
+        results[:] = _apply_batch(function, uniques.tolist(), workers)
+        return results[inverse.reshape(-1)].reshape(values.shape)
+
+    index = {}
+    uniques = []
+    positions = []
+    for value in values:
+        key = _get_batch_key(value)
+        if key is None:
+            positions.append(len(uniques))
+            uniques.append(value)
+            continue
+        try:
+            positions.append(index[key])
+        except (KeyError):
+            index[key] = len(uniques)
+            positions.append(len(uniques))
+            uniques.append(value)
+    results = _apply_batch(function, uniques, workers)
+    out = [results[i] for i in positions]
+    if is_array:
+        array = numpy.empty(len(out), dtype=object)
+        array[:] = out
+        return array.reshape(values.shape)
+    return out
+
+
+def normalize_many(values, lower: bool=True, workers: int=None):
+    """Igual que Text.normalize() para una lista o columna de textos."""
+    return map_texts(functools.partial(Text.normalize, lower=lower), values, 
+        workers=workers)
+
+
+def get_tag_many(values, combinate: bool=False, allow: str=None, 
+    workers: int=None):
+    """Igual que Text.get_tag() para una lista o columna de textos."""
+    return map_texts(functools.partial(Text.get_tag, combinate=combinate, 
+        allow=allow), values, workers=workers)
+
+
+def get_tags_many(values, combinate: bool=False, allow: str=None, 
+    workers: int=None):
+    """
+    Igual que Text.get_tags() para una lista de textos o de filas, Ej. 
+    [(nombre, código, referencia), ...].
+    """
+    return map_texts(functools.partial(Text.get_tags, combinate=combinate, 
+        allow=allow), values, workers=workers)
@@ -0,0 +1,262 @@
+"""
+Índice de trigramas en memoria para búsquedas aproximadas (autocompletado)
+sobre los nombres normalizados (Text.normalize) de un modelo, por empresa.
+
+Se habilita por modelo, por lo general en AppConfig.ready():
+    from unoletutils.libs import trigram
+    trigram.register(Item, field="name", company_field="company")
+
+Y se consulta con:
+    trigram.search(Item, company, "cafe con", limit=10) -> [(pk, score), ...]
+
+Cada proceso mantiene sus propios índices. Se cargan la primera vez que se
+consultan y se actualizan al guardar o eliminar objetos en este proceso. Los
+cambios hechos desde otros procesos se reflejan al recargar con reset().
+"""
+
+import array
+import collections
+import heapq
+import itertools
+import threading
+
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.signals import post_delete, post_save
+
+from unoletutils.libs.text import Text
+
+
+# Modelos habilitados {modelo: (campo, campo de la empresa)}.
+REGISTRY = {}
+# Índices cargados {(modelo, pk de la empresa): TrigramIndex}.
+INDEXES = {}
+
+_lock = threading.Lock()
+
+
+class TrigramError(Exception):
+    pass
+
+
+def get_trigrams(text: str, prefix: bool=False) -> set:
+    """
+    Obtiene los trigramas del texto normalizado. Cada palabra se rellena con
+    dos espacios al inicio y uno al final (igual que pg_trgm).
+
+    Parameters:
+        text (str): texto.
+        prefix (bool): si es True, la última palabra no se rellena al final,
+            ya que puede estar incompleta (autocompletado).
+    """
+    words = Text.normalize(text).split()
+    out = set()
+    last = len(words) - 1
+    for (i, word) in enumerate(words):
+        padded = f"  {word}" if (prefix and i == last) else f"  {word} "
+        out.update(padded[j:j + 3] for j in range(len(padded) - 2))
+    return out
+
+
+class TrigramIndex:
+    """
+    Índice invertido de trigramas. Cada trigrama apunta a un array de enteros
+    con los documentos que lo contienen, en lugar de un set de Python por
+    trigrama. Los documentos eliminados se marcan y se descartan al compactar.
+    """
+    # Proporción de documentos eliminados a partir de la cual se compacta.
+    compact_ratio = 0.25
+
+    def __init__(self):
+        # trigrama -> array("I") de documentos (en orden ascendente).
+        self.postings = {}
+        # documento -> pk (None si fue eliminado).
+        self.keys = []
+        # documento -> cantidad de trigramas.
+        self.sizes = array.array("H")
+        # pk -> documento.
+        self.documents = {}
+        self.deleted = 0
+        self.lock = threading.RLock()
+
+    def __repr__(self):
+        return (f"<TrigramIndex documentos={len(self.documents)} "
+            f"trigramas={len(self.postings)}>")
+
+    def __len__(self):
+        return len(self.documents)
+
+    def __contains__(self, pk):
+        return pk in self.documents
+
+    def add(self, pk, text):
+        """Agrega o reemplaza el texto del objeto indicado."""
+        with self.lock:
+            self._remove(pk)
+            # Al editar un objeto su documento anterior queda eliminado.
+            self._compact_if_needed()
+            trigrams = get_trigrams(text)
+            if not trigrams:
+                return
+            doc = len(self.keys)
+            self.keys.append(pk)
+            self.sizes.append(min(len(trigrams), 0xFFFF))
+            self.documents[pk] = doc
+            for trigram in trigrams:
+                try:
+                    self.postings[trigram].append(doc)
+                except (KeyError):
+                    self.postings[trigram] = array.array("I", (doc,))
+
+    def load(self, rows):
+        """Agrega los pares (pk, texto) indicados."""
+        for (pk, text) in rows:
+            self.add(pk, text)
+
+    def _remove(self, pk):
+        doc = self.documents.pop(pk, None)
+        if doc is not None:
+            self.keys[doc] = None
+            self.deleted += 1
+
+    def _compact_if_needed(self):
+        if self.deleted > len(self.keys) * self.compact_ratio:
+            self.compact()
+
+    def remove(self, pk):
+        """Elimina el objeto indicado del índice."""
+        with self.lock:
+            self._remove(pk)
+            self._compact_if_needed()
+
+    def compact(self):
+        """Descarta los documentos eliminados de los arrays del índice."""
+        with self.lock:
+            remap = array.array("l", itertools.repeat(-1, len(self.keys)))
+            keys = []
+            sizes = array.array("H")
+            for (doc, pk) in enumerate(self.keys):
+                if pk is not None:
+                    remap[doc] = len(keys)
+                    self.documents[pk] = len(keys)
+                    keys.append(pk)
+                    sizes.append(self.sizes[doc])
+            postings = {}
+            for (trigram, docs) in self.postings.items():
+                docs = array.array("I", (remap[d] for d in docs if remap[d] >= 0))
+                if docs:
+                    postings[trigram] = docs
+            self.postings, self.keys, self.sizes = postings, keys, sizes
+            self.deleted = 0
+
+    def search(self, text: str, limit: int=10, min_score: float=0.3) -> list:
+        """
+        Obtiene los 'limit' objetos más similares al texto indicado como
+        [(pk, score), ...], de mayor a menor similitud.
+
+        El score es la proporción de los trigramas del texto presentes en el
+        objeto (0 a 1). A igual score, se prefieren los textos más cortos.
+        """
+        trigrams = get_trigrams(text, prefix=True)
+        if not trigrams:
+            return []
+        n = len(trigrams)
+        with self.lock:
+            counts = collections.Counter(itertools.chain.from_iterable(
+                self.postings[t] for t in trigrams if t in self.postings))
+            keys, sizes = self.keys, self.sizes
+            minimum = min_score * n
+            candidates = ((shared / n, shared / (n + sizes[doc] - shared), doc)
+                for (doc, shared) in counts.items()
+                if shared >= minimum and keys[doc] is not None)
+            best = heapq.nlargest(limit, candidates)
+            return [(keys[doc], score) for (score, _, doc) in best]
+
+
+def _get_config(model) -> tuple:
+    try:
+        return REGISTRY[model]
+    except (KeyError):
+        raise TrigramError(f"El modelo {model.__name__} no tiene un índice de "
+            "trigramas. Habilítelo con trigram.register().")
+
+
+def get_company_pk(instance, company_field: str):
+    """Obtiene el pk de la empresa del objeto sin consultarla, si es posible."""
+    if LOOKUP_SEP not in company_field:
+        return getattr(instance,
+            instance._meta.get_field(company_field).attname, None)
+    value = instance
+    for name in company_field.split(LOOKUP_SEP):
+        value = getattr(value, name, None)
+        if value is None:
+            return None
+    return value.pk
+
+
+def get_index(model, company) -> TrigramIndex:
+    """
+    Obtiene el índice del modelo en la empresa indicada, cargándolo desde la
+    base de datos la primera vez.
+    """
+    field, company_field = _get_config(model)
+    key = (model, getattr(company, "pk", company))
+    index = INDEXES.get(key)
+    if index is not None:
+        return index
+    with _lock:
+        index = INDEXES.get(key)
+        if index is None:
+            index = TrigramIndex()
+            index.load(model._default_manager.filter(
+                **{company_field: key[1]}).values_list("pk", field).iterator(
+                chunk_size=2000))
+            INDEXES[key] = index
+    return index
+
+
+def search(model, company, text: str, limit: int=10,
+    min_score: float=0.3) -> list:
+    """Ver TrigramIndex.search()."""
+    return get_index(model, company).search(text, limit=limit,
+        min_score=min_score)
+
+
+def reset(model=None, company=None):
+    """Descarta los índices cargados (todos, de un modelo o de una empresa)."""
+    company = getattr(company, "pk", company)
+    with _lock:
+        for key in list(INDEXES):
+            if ((model is None or key[0] is model) and
+                (company is None or key[1] == company)):
+                del INDEXES[key]
+
+
+def _post_save(sender, instance, **kwargs):
+    field, company_field = REGISTRY[sender]
+    company = get_company_pk(instance, company_field)
+    for ((model, pk), index) in list(INDEXES.items()):
+        if model is not sender:
+            continue
+        if pk == company:
+            index.add(instance.pk, getattr(instance, field))
+        elif instance.pk in index:
+            # El objeto cambió de empresa.
+            index.remove(instance.pk)
+
+
+def _post_delete(sender, instance, **kwargs):
+    for ((model, pk), index) in list(INDEXES.items()):
+        if model is sender:
+            index.remove(instance.pk)
+
+
+def register(model, field: str="name", company_field: str="company"):
+    """
+    Habilita el índice de trigramas del campo indicado del modelo y lo
+    mantiene actualizado al guardar y eliminar objetos.
+    """
+    REGISTRY[model] = (field, company_field)
+    post_save.connect(_post_save, sender=model, weak=False,
+        dispatch_uid=f"unoletutils.trigram.{model._meta.label_lower}")
+    post_delete.connect(_post_delete, sender=model, weak=False,
+        dispatch_uid=f"unoletutils.trigram.{model._meta.label_lower}")
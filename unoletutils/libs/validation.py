@@ -0,0 +1,163 @@
+"""
+Validación masiva de columnas de cédulas, RNC y teléfonos (Ej. importaciones
+desde CSV), sin lanzar una excepción por cada valor inválido.
+
+Cada fila se devuelve con sus valores normalizados y los errores se acumulan
+en un reporte estructurado (fila, columna, valor, motivo):
+    report = validation.validate_csv(f, {"cedula": "cedula", "tel": "phone"})
+    report.is_valid, report.errors
+"""
+
+import collections
+import csv
+
+from unoletutils.libs.text import TextError, check_identification, check_phone
+
+
+RowError = collections.namedtuple("RowError", ("row", "column", "value", "reason"))
+
+
+def check_cedula(text) -> tuple:
+    """Cédula de identidad y electoral, Ej. 000-0000000-0."""
+    return check_identification(text, length=11)
+
+
+def check_rnc(text) -> tuple:
+    """Registro nacional del contribuyente, Ej. 000-00000-0."""
+    return check_identification(text, length=9)
+
+
+# Validadores disponibles. Cada uno retorna (valor, None) o (None, motivo).
+VALIDATORS = {
+    "cedula": check_cedula,
+    "rnc": check_rnc,
+    "phone": check_phone,
+}
+
+
+def get_validator(validator):
+    """Obtiene el validador por su nombre o lo devuelve si es una función."""
+    if callable(validator):
+        return validator
+    try:
+        return VALIDATORS[validator]
+    except (KeyError):
+        raise TextError(f"El validador '{validator}' no existe. Las opciones "
+            f"son: {', '.join(VALIDATORS)}.")
+
+
+def iter_validate(rows, columns, allow_empty: bool=True, start: int=1):
+    """
+    Recorre las filas indicadas validando sus columnas. Obtiene por cada fila
+    (número de fila, fila normalizada, [RowError, ...]). Los valores inválidos
+    se reemplazan por None en la fila normalizada.
+
+    Parameters:
+        rows (iter): filas (dict o list). No se cargan todas en memoria.
+        columns (dict): {columna: validador}, el validador puede ser el nombre
+            de uno de VALIDATORS o una función que retorne (valor, motivo).
+        allow_empty (bool): si es False, los valores vacíos son errores.
+        start (int): número de la primera fila en el reporte.
+    """
+    checks = [(column, get_validator(v)) for (column, v) in columns.items()]
+    for (number, row) in enumerate(rows, start):
+        row = row.copy() if isinstance(row, dict) else list(row)
+        errors = []
+        for (column, check) in checks:
+            try:
+                value = row[column]
+            except (KeyError, IndexError):
+                value = None
+            if value is None or value == "":
+                if not allow_empty:
+                    errors.append(RowError(number, column, value, 
+                        "Este campo es obligatorio."))
+                continue
+            if not isinstance(value, str):
+                value = str(value)
+            cleaned, reason = check(value)
+            if reason is not None:
+                errors.append(RowError(number, column, value, reason))
+            row[column] = cleaned
+        yield number, row, errors
+
+
+class ValidationReport:
+    """Resultado de una validación masiva."""
+
+    def __init__(self, rows=None, errors=None, count: int=0):
+        self.rows = rows if rows is not None else []
+        self.errors = errors if errors is not None else []
+        self.count = count
+
+    def __repr__(self):
+        return f"<ValidationReport filas={self.count} errores={len(self.errors)}>"
+
+    @property
+    def is_valid(self) -> bool:
+        return not self.errors
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "is_valid": self.is_valid,
+            "errors": [e._asdict() for e in self.errors],
+        }
+
+
+def validate_rows(rows, columns, allow_empty: bool=True, start: int=1, 
+    keep_rows: bool=True) -> ValidationReport:
+    """
+    Valida las filas indicadas (ver iter_validate) y obtiene el reporte.
+    Si keep_rows es False no se guardan las filas normalizadas, solo los
+    errores, útil para validar archivos grandes antes de importarlos.
+    """
+    report = ValidationReport()
+    for (number, row, errors) in iter_validate(rows, columns, allow_empty, start):
+        report.count += 1
+        report.errors.extend(errors)
+        if keep_rows:
+            report.rows.append(row)
+    return report
+
+
+def validate_column(values, validator, column=None, allow_empty: bool=True, 
+    start: int=1) -> ValidationReport:
+    """
+    Valida una sola columna de valores. Las filas del reporte son los valores
+    normalizados (None si son inválidos).
+    """
+    check = get_validator(validator)
+    report = ValidationReport()
+    append, errors = report.rows.append, report.errors
+    for (number, value) in enumerate(values, start):
+        report.count += 1
+        if value is None or value == "":
+            if not allow_empty:
+                errors.append(RowError(number, column, value, 
+                    "Este campo es obligatorio."))
+            append(value)
+            continue
+        if not isinstance(value, str):
+            value = str(value)
+        cleaned, reason = check(value)
+        if reason is not None:
+            errors.append(RowError(number, column, value, reason))
+        append(cleaned)
+    return report
+
+
+def validate_csv(f, columns, allow_empty: bool=True, keep_rows: bool=True, 
+    **reader_kwargs) -> ValidationReport:
+    """
+    Valida el archivo CSV indicado (con encabezados) fila por fila. Las filas
+    se numeran como en el archivo, la primera fila de datos es la 2.
+
+    Parameters:
+        f (file): archivo abierto en modo texto (newline="").
+        columns (dict): {encabezado: validador}.
+        reader_kwargs: argumentos para csv.DictReader (delimiter, etc.).
+    """
+    reader = csv.DictReader(f, **reader_kwargs)
+    return validate_rows(reader, columns, allow_empty=allow_empty, start=2, 
+        keep_rows=keep_rows)
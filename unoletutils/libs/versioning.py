@@ -0,0 +1,99 @@
+"""
+Versiones de los objetos a partir de su fecha de modificación o su historial,
+útiles para construir claves de caché y validar respuestas condicionales.
+"""
+
+import datetime
+
+from django.db.models import OuterRef, Subquery
+
+
+# Campos que contienen la fecha de la última modificación del objeto.
+VERSION_FIELDS = ("update_date",)
+# Nombre de la anotación con la versión obtenida del historial.
+VERSION_ANNOTATION = "_version"
+
+
+def get_version_field(model):
+    """Obtiene el nombre del campo de modificación del modelo o None."""
+    names = {f.name for f in model._meta.concrete_fields}
+    for name in VERSION_FIELDS:
+        if name in names:
+            return name
+    return None
+
+
+def get_history_model(model):
+    """Obtiene el modelo histórico (django-simple-history) o None."""
+    try:
+        return model.history.model
+    except (AttributeError):
+        return None
+
+
+def get_history_subquery(model):
+    """
+    Obtiene la subconsulta con la fecha del último registro histórico de cada
+    objeto del modelo o None si el modelo no posee historial.
+    """
+    history_model = get_history_model(model)
+    if history_model is None:
+        return None
+    return Subquery(history_model.objects.filter(
+        **{model._meta.pk.attname: OuterRef("pk")}).order_by(
+        "-history_date").values("history_date")[:1])
+
+
+def annotate_versions(queryset):
+    """
+    Si el modelo no posee un campo de modificación, anota en cada objeto la
+    fecha de su último registro histórico, evitando una consulta por objeto.
+    """
+    if get_version_field(queryset.model):
+        return queryset
+    subquery = get_history_subquery(queryset.model)
+    if subquery is None:
+        return queryset
+    return queryset.annotate(**{VERSION_ANNOTATION: subquery})
+
+
+def get_version(obj):
+    """
+    Obtiene la fecha de la última modificación del objeto desde su campo de
+    modificación, la anotación de annotate_versions() o su historial.
+    Retorna None si no es posible determinarla.
+    """
+    field = get_version_field(obj.__class__)
+    if field:
+        return getattr(obj, field)
+    try:
+        return getattr(obj, VERSION_ANNOTATION)
+    except (AttributeError):
+        pass
+    history_model = get_history_model(obj.__class__)
+    if history_model is None:
+        return None
+    return history_model.objects.filter(
+        **{obj._meta.pk.attname: obj.pk}).order_by(
+        "-history_date").values_list("history_date", flat=True).first()
+
+
+def to_token(value) -> str:
+    """Convierte el valor de una versión en un texto apto para claves."""
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    return str(value)
+
+
+def get_fragment_key(obj, name: str, company=None, language=None):
+    """
+    Obtiene la clave de caché del fragmento 'name' del objeto, compuesta por
+    la empresa, el idioma, el modelo, el pk y la versión del objeto.
+    Retorna None si el objeto no tiene versión.
+    """
+    version = get_version(obj)
+    if version is None:
+        return None
+    return "unoletutils.fragment.{}.{}.{}.{}.{}.{}".format(
+        getattr(company, "pk", company), language, obj._meta.label_lower,
+        obj.pk, to_token(version), name)
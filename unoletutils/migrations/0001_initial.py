@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 01:58
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PrintLog',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.CharField(max_length=64, verbose_name='objeto')),
+                ('date', models.DateTimeField(default=django.utils.timezone.now, verbose_name='fecha')),
+                ('is_reprint', models.BooleanField(default=False, verbose_name='reimpresión')),
+                ('is_test', models.BooleanField(default=False, verbose_name='prueba')),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype', verbose_name='tipo')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='usuario')),
+            ],
+            options={
+                'verbose_name': 'impresión',
+                'verbose_name_plural': 'impresiones',
+                'indexes': [models.Index(fields=['content_type', 'object_id', 'date'], name='unoletutils_content_ebccc5_idx')],
+            },
+        ),
+    ]
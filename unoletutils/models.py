@@ -1,6 +1,10 @@
 import warnings
 
+from django.conf import settings
+from django.contrib.contenttypes.fields import GenericForeignKey
+from django.contrib.contenttypes.models import ContentType
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext as _
 from django.utils.translation import gettext_lazy as _l
 from django.urls import reverse_lazy, NoReverseMatch
@@ -41,7 +45,8 @@ class ModelBase(models.Model, text.Text):
 
     def clean(self):
         try:
-            self.tags = text.Text.get_tag(str(self), combinate=True)[:700]
+            self.tags = text.Text.get_tag(str(self), combinate=True, 
+                max_bytes=text.TAGS_MAX_BYTES)
         except (AttributeError):
             pass
 
@@ -475,3 +480,116 @@ class ModelBase(models.Model, text.Text):
             return False
         return bool(self.history.count())
 
+
+class PrintLog(models.Model):
+    """
+    Registro compacto de cada impresión de un objeto.
+
+    Reemplaza guardar el objeto completo y su historial al imprimir: solo se 
+    actualiza el campo 'is_printed' del objeto y se inserta este registro.
+    """
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, 
+        verbose_name=_l("tipo"))
+    object_id = models.CharField(_l("objeto"), max_length=64)
+    content_object = GenericForeignKey("content_type", "object_id")
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, 
+        null=True, blank=True, related_name="+", verbose_name=_l("usuario"))
+    date = models.DateTimeField(_l("fecha"), default=timezone.now)
+    is_reprint = models.BooleanField(_l("reimpresión"), default=False)
+    is_test = models.BooleanField(_l("prueba"), default=False)
+
+    class Meta:
+        verbose_name = _l("impresión")
+        verbose_name_plural = _l("impresiones")
+        indexes = [models.Index(fields=["content_type", "object_id", "date"])]
+
+    def __str__(self):
+        return f"{self.get_description()} {self.content_type} {self.object_id}"
+
+    def get_description(self) -> str:
+        out = _("Re-imprimió") if self.is_reprint else _("Imprimió")
+        if self.is_test:
+            out += _(" (prueba)")
+        return out
+
+    @classmethod
+    def get_log(cls, obj, user=None):
+        """Obtiene (sin guardar) el registro de impresión del objeto."""
+        return cls(content_type=ContentType.objects.get_for_model(obj), 
+            object_id=str(obj.pk), 
+            user_id=getattr(user, "pk", None),
+            is_reprint=bool(getattr(obj, "is_printed", False)), 
+            is_test=bool(getattr(user, "is_staff", False)))
+
+    @classmethod
+    def set_printed(cls, model, pks):
+        """Marca como impresos (is_printed) los objetos indicados."""
+        if any(f.name == "is_printed" for f in model._meta.concrete_fields):
+            model._default_manager.filter(pk__in=pks, is_printed=False).update(
+                is_printed=True)
+
+    @classmethod
+    def record(cls, obj, user=None):
+        """
+        Registra la impresión del objeto: actualiza solo su campo 'is_printed'
+        e inserta un registro de impresión.
+        """
+        log = cls.get_log(obj, user)
+        if not log.is_reprint:
+            cls.set_printed(obj.__class__, [obj.pk])
+        log.save()
+        if hasattr(obj, "is_printed"):
+            obj.is_printed = True
+        return log
+
+    @classmethod
+    def get_for_object(cls, obj):
+        """Obtiene las impresiones del objeto, de la más reciente a la primera."""
+        return cls.objects.filter(
+            content_type=ContentType.objects.get_for_model(obj), 
+            object_id=str(obj.pk)).order_by("-date")
+
+
+class PrintLogBuffer:
+    """
+    Acumula registros de impresión para insertarlos en bloque (impresión por 
+    lotes). Se guardan al alcanzar 'size' registros o al salir del bloque with.
+
+        with PrintLogBuffer(user=request.user) as buffer:
+            for obj in queryset:
+                buffer.add(obj)
+    """
+
+    def __init__(self, user=None, size: int=500):
+        self.user = user
+        self.size = size
+        self.logs = []
+        self.objects = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+
+    def add(self, obj):
+        self.logs.append(PrintLog.get_log(obj, self.user))
+        self.objects.append(obj)
+        if len(self.logs) >= self.size:
+            self.flush()
+
+    def flush(self):
+        """Guarda los registros acumulados (un UPDATE por modelo y un INSERT)."""
+        if not self.logs:
+            return
+        pks = {}
+        for (obj, log) in zip(self.objects, self.logs):
+            if not log.is_reprint:
+                pks.setdefault(obj.__class__, []).append(obj.pk)
+            if hasattr(obj, "is_printed"):
+                obj.is_printed = True
+        for (model, model_pks) in pks.items():
+            PrintLog.set_printed(model, model_pks)
+        PrintLog.objects.bulk_create(self.logs)
+        self.logs = []
+        self.objects = []
@@ -1,5 +1,85 @@
+import decimal
+
 from django import template 
+from django.core.cache import caches
+
+from unoletutils.libs.text import Text
 
 register = template.Library()
 
-# Pendiente de desarrollo.
\ No newline at end of file
+
+class FragmentCacheNode(template.Node):
+
+    def __init__(self, nodelist, obj, name):
+        self.nodelist = nodelist
+        self.obj = obj
+        self.name = name
+
+    def render(self, context):
+        view = context.get("view")
+        obj = self.obj.resolve(context)
+        name = self.name.resolve(context)
+        try:
+            key = view.get_fragment_cache_key(obj, name)
+        except (AttributeError):
+            key = None
+        if key is None:
+            return self.nodelist.render(context)
+
+        # En los listados se obtienen de una vez los fragmentos de la página.
+        objects = context.get("object_list") or [obj]
+        value = view.get_cached_fragments(objects, name).get(key)
+        if value is None:
+            cache = caches[view.fragment_cache_alias]
+            value = cache.get(key)
+            if value is None:
+                value = self.nodelist.render(context)
+                cache.set(key, value, view.fragment_cache_timeout)
+        return value
+
+
+@register.tag
+def fragmentcache(parser, token):
+    """
+    Guarda en caché el fragmento renderizado para el objeto indicado, según 
+    su versión (update_date o historial), la empresa y el idioma actual. 
+    Requiere una vista con 'fragment_cache_timeout' (BaseList, DetailView).
+
+        {% fragmentcache object "row" %}
+            ...
+        {% endfragmentcache %}
+    """
+    bits = token.split_contents()
+    if len(bits) != 3:
+        raise template.TemplateSyntaxError(
+            f"'{bits[0]}' requiere dos argumentos: objeto y nombre.")
+    nodelist = parser.parse(("endfragmentcache",))
+    parser.delete_first_token()
+    return FragmentCacheNode(nodelist, parser.compile_filter(bits[1]), 
+        parser.compile_filter(bits[2]))
+
+
+@register.filter
+def number_to_letter(value, moneda="dop"):
+    """
+    Monto en letras (Text.number_to_letter), Ej. {{ total|number_to_letter }}
+    o {{ total|number_to_letter:"usd" }}. Los montos ya convertidos se toman
+    de la caché.
+    """
+    if value in (None, ""):
+        return ""
+    try:
+        return Text.number_to_letter(value, moneda=moneda)
+    except (decimal.InvalidOperation, ValueError, TypeError, OverflowError):
+        return ""
+
+
+@register.filter
+def number_to_words(value):
+    """Número en letras sin moneda, Ej. {{ quantity|number_to_words }}."""
+    if value in (None, ""):
+        return ""
+    try:
+        return Text.number_to_letter(value, in_moneda=False)
+    except (decimal.InvalidOperation, ValueError, TypeError, OverflowError):
+        return ""
@@ -0,0 +1,11 @@
+from django.urls import path
+
+from unoletutils import views
+
+
+app_name = "unoletutils"
+
+urlpatterns = [
+    path("pdf/<str:job>/", views.pdf_job, name="pdf-job"),
+    path("pdf/batch/<str:batch>/", views.pdf_batch, name="pdf-batch"),
+]
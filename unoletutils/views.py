@@ -1,28 +1,31 @@
 import copy
+import datetime
 import functools
+import hashlib
 import warnings
 
-from django.core.exceptions import FieldError
 from django.shortcuts import render, get_object_or_404, get_list_or_404
 from django.template.loader import render_to_string
-from django.http import Http404, HttpResponse
+from django.urls import NoReverseMatch, reverse
+from django.http import (FileResponse, Http404, HttpResponse, JsonResponse, 
+    StreamingHttpResponse)
 from django.core.exceptions import PermissionDenied
 from django.contrib.auth.decorators import login_required, permission_required
+from django.core.cache import caches
+from django.db.models import Count, Max, QuerySet
+from django.utils.cache import (get_conditional_response, patch_cache_control, 
+    patch_vary_headers)
+from django.utils.http import http_date, quote_etag
+from django.utils.translation import get_language
 from django.utils.translation import gettext as _
 from django.utils.translation import gettext_lazy as _l
 from django.views import generic
 from django.contrib import messages
 
-try:
-    from weasyprint import HTML as weasyprintHTML
-    from weasyprint.fonts import FontConfiguration as weasyprintFontConfiguration
-except (ImportError) as e:
-    warnings.warn(f"Es necesario el paquete 'weasyprint' para poder imprimir en PDF. {e}.")
-except (OSError) as e:
-    pass # warnings.warn(str(e) + ". Por lo general este error se presenta en Windows por falta de la librería 'cairo'.")
-except (BaseException) as e:
-    warnings.warn(str(e))
-
+from unoletutils.libs import (filters, json, pagination, pdf, permissions, 
+    table, versioning)
+from unoletutils.libs.text import Text
+from unoletutils.models import PrintLog, PrintLogBuffer
 
 
 class ViewError(Exception):
@@ -127,6 +130,18 @@ class BaseView():
     title = ""
     # Módulo actual.
     module = None 
+    # Cantidad de consultas evitadas en esta solicitud (ver 'memoize').
+    lookups_avoided = 0
+    # Caché de permisos entre solicitudes (libs.permissions.PermissionCache).
+    # Si es None se utilizará la indicada en settings.py, si existe.
+    permission_cache = None
+    # Si es True, las solicitudes GET responden 304 (Not Modified) cuando el
+    # contenido no ha cambiado según su ETag/Last-Modified (ver get_etag).
+    conditional_get = False
+    # Segundos que se guardarán los fragmentos renderizados con la etiqueta
+    # {% fragmentcache object "nombre" %}. Si es None no se guardarán.
+    fragment_cache_timeout = None
+    fragment_cache_alias = "default"
 
     def get_title(self):
         """Obtiene el valor del título que se mostrará en la página."""
@@ -136,8 +151,34 @@ class BaseView():
             vnp = ""
         return str(self.title or self.get_object() or vnp)
 
+    def memoize(self, key, function, *args, **kwargs):
+        """
+        Obtiene el resultado de function(*args, **kwargs) una sola vez durante 
+        la vida de esta vista (una solicitud). Las siguientes llamadas con la 
+        misma clave devuelven el resultado guardado y se contabilizan en 
+        'lookups_avoided' (también disponible en request.lookups_avoided).
+        """
+        memo = self.__dict__.setdefault("_memo", {})
+        try:
+            value = memo[key]
+        except (KeyError):
+            value = memo[key] = function(*args, **kwargs)
+            return value
+        self._add_lookup_avoided()
+        return value
+
+    def _add_lookup_avoided(self):
+        self.lookups_avoided += 1
+        try:
+            self.request.lookups_avoided = self.lookups_avoided
+        except (AttributeError):
+            pass
+
     def get_company(self):
         """Obtiene la instancia de la empresa actual."""
+        return self.memoize("company", self._get_company)
+
+    def _get_company(self):
         try:
             company = self.request.company
         except (AttributeError):
@@ -147,13 +188,45 @@ class BaseView():
                 company = get_object_or_404(Company, pk=kwargs[self.company_in_url])
         return company
 
+    def _user_has_access(self, company):
+        """Comprueba si el usuario actual tiene acceso a la empresa indicada."""
+        return self.memoize(("access", company.pk), company.user_has_access, 
+            self.request.user)
+
+    def _get_permission_entry(self):
+        """
+        Obtiene la entrada de permisos del usuario en la empresa desde la caché
+        de permisos (una sola consulta por solicitud) o None si no hay caché.
+        """
+        cache = self.permission_cache or permissions.get_permission_cache()
+        if cache is None:
+            return None
+        return self.memoize("permission_entry", cache.get, self.request.user, 
+            self.get_company())
+
+    def _has_company_permission(self, permission):
+        """Comprueba si el usuario actual posee el permiso en la empresa."""
+        key = permission if isinstance(permission, str) else tuple(permission)
+        entry = self._get_permission_entry()
+        if entry is not None:
+            return self.memoize(("permission", key), entry.has_permission, 
+                permission)
+        return self.memoize(("permission", key), 
+            self.request.user.has_company_permission, 
+            company=self.get_company(), permission=permission)
+
     def get_object(self, queryset=None):
         """
         Método Django que obtiene el objeto actual.
         Se hicieron algunas modificaciones para asegurarnos de que el objeto 
         devuelto pertenezca a la empresa actual. (no se puede mostrar un 
         registro de una empresa en otra.)
+
+        El objeto se obtiene una sola vez por solicitud.
         """
+        return self.memoize("object", self._get_object)
+
+    def _get_object(self):
         company = self.get_company()
         company_pk = self.kwargs.get(self.company_in_url)
         pk = self.kwargs.get(self.pk_in_url)
@@ -172,16 +245,22 @@ class BaseView():
             if obj_company != company:
                 raise Http404(f"La empresa {company} no es la misma empresa "
                     f"del objeto {obj_company}")
-        
+        self._check_company(company)
+        return obj
+
+    def _check_company(self, company):
+        """
+        Comprueba que la empresa esté activa y que el usuario actual tenga 
+        acceso a ella. De lo contrario lanza Http404.
+        """
         # La empresa debe estar activa.
         if not company.is_active:
             raise Http404(f"La empresa {company} no está activa.")
 
         # El usuario debe tener acceso a esta empresa.
-        if not company.user_has_access(self.request.user):
+        if not self._user_has_access(company):
             raise Http404(
                 f"El usuario {self.request.user} no pertenece a {company}")
-        return obj
 
     def dispatch(self, request, *args, **kwargs):
         """
@@ -191,20 +270,141 @@ class BaseView():
         if self.error_list:
             raise ViewError(". ".join(error_list))
         if self.company_permission_required:
-            if not request.user.has_company_permission(
-                company=self.get_company(), 
-                permission=self.company_permission_required):
+            if not self._has_company_permission(
+                self.company_permission_required):
                 raise PermissionDenied(
                     "Acceso denegado. No cuenta con permisos suficientes.")
-        return super().dispatch(request, *args, **kwargs)
+        conditional = self.conditional_get and request.method in ("GET", "HEAD")
+        if conditional:
+            response = self.get_conditional_response()
+            if response is not None:
+                return response
+        response = super().dispatch(request, *args, **kwargs)
+        if conditional and response.status_code == 200:
+            self.set_conditional_headers(response)
+        return response
+
+    def get_last_modified(self):
+        """
+        Obtiene la fecha de la última modificación del contenido de la página,
+        desde 'update_date' o el historial del objeto actual, o None.
+        """
+        obj = self.get_object()
+        if not obj:
+            return None
+        if isinstance(obj, ObjectCapsule):
+            obj = obj._obj
+        return self.memoize("last_modified", versioning.get_version, obj)
+
+    def get_etag_data(self) -> list:
+        """Valores de los que depende el contenido de la página."""
+        return [self.request.get_full_path(), 
+            getattr(self.request.user, "pk", None), 
+            getattr(self.get_company(), "pk", None), get_language(), 
+            self.get_response_format()]
+
+    def get_response_format(self):
+        """
+        Formato negociado de la respuesta ("json" o "html") si la misma url
+        puede responder ambos (JsonViewMixin), de lo contrario None.
+        """
+        json_requested = getattr(self, "json_requested", None)
+        if json_requested is None:
+            return None
+        return "json" if json_requested() else "html"
+
+    def get_content_version(self):
+        """Valores que cambian cuando cambia el contenido de la página o None."""
+        last_modified = self.get_last_modified()
+        if last_modified is None:
+            return None
+        return [last_modified]
+
+    def get_etag(self):
+        """
+        Obtiene el ETag de la página a partir de la versión del contenido y el
+        usuario, la empresa, el idioma y la url actual, o None.
+        """
+        version = self.get_content_version()
+        if version is None:
+            return None
+        data = [versioning.to_token(v) for v in version] + self.get_etag_data()
+        return quote_etag(hashlib.md5(
+            "|".join(str(v) for v in data).encode("utf-8")).hexdigest())
+
+    def get_conditional_response(self):
+        """
+        Obtiene la respuesta 304 (Not Modified) si el contenido que el cliente
+        posee no ha cambiado, sin renderizar la plantilla. De lo contrario None.
+        """
+        etag = self.get_etag()
+        if etag is None:
+            return None
+        last_modified = self.get_last_modified()
+        if isinstance(last_modified, datetime.datetime):
+            last_modified = int(last_modified.timestamp())
+        else:
+            last_modified = None
+        response = get_conditional_response(self.request, etag=etag, 
+            last_modified=last_modified)
+        if response is not None and response.status_code == 304:
+            # Las mismas cabeceras de la respuesta completa (RFC 7232 4.1).
+            self.set_conditional_headers(response)
+        return response
+
+    def set_conditional_headers(self, response):
+        etag = self.get_etag()
+        if etag is None:
+            return
+        last_modified = self.get_last_modified()
+        if not response.has_header("ETag"):
+            response["ETag"] = etag
+        if (isinstance(last_modified, datetime.datetime) and 
+            not response.has_header("Last-Modified")):
+            response["Last-Modified"] = http_date(last_modified.timestamp())
+        # El contenido depende del usuario, siempre debe revalidarse.
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ("Cookie",))
+        if self.get_response_format() is not None:
+            patch_vary_headers(response, ("Accept",))
+
+    def get_fragment_cache_key(self, obj, name):
+        """
+        Obtiene la clave del fragmento 'name' del objeto por empresa, idioma y
+        versión del objeto, o None si no se deben guardar fragmentos.
+        """
+        if self.fragment_cache_timeout is None:
+            return None
+        if isinstance(obj, ObjectCapsule):
+            obj = obj._obj
+        return versioning.get_fragment_key(obj, name, 
+            company=self.get_company(), language=get_language())
+
+    def get_cached_fragments(self, objects, name) -> dict:
+        """
+        Obtiene de la caché (una sola consulta) los fragmentos 'name' guardados 
+        de los objetos indicados, Ej. todas las filas de la página actual.
+        """
+        def get_many():
+            keys = [self.get_fragment_cache_key(obj, name) for obj in objects]
+            return caches[self.fragment_cache_alias].get_many(
+                [key for key in keys if key])
+        return self.memoize(("fragments", name), get_many)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         user = self.request.user
         company = self.get_company()
+        entry = self._get_permission_entry()
         # Permisos y grupos que posee y pertenece el usuario actual.
-        context["user_company_permissions"] = user.get_company_permissions(company)
-        context["user_company_groups"] = user.get_company_groups(company)
+        if entry is not None:
+            context["user_company_permissions"] = entry.get_permissions()
+            context["user_company_groups"] = entry.get_groups()
+        else:
+            context["user_company_permissions"] = self.memoize(
+                "company_permissions", user.get_company_permissions, company)
+            context["user_company_groups"] = self.memoize(
+                "company_groups", user.get_company_groups, company)
         return context
 
 
@@ -214,7 +414,28 @@ class BaseList(BaseView):
     list_display = [("__str__", _l("nombre"))]
     list_display_cssclass = {}
     list_display_links = ["__str__"]
-    #search_form_class = SearchForm *---------------------------------------------------------
+    # Paginación por cursor (keyset). Si es True se paginará sobre el orden
+    # indicado en 'cursor_ordering' con tokens opacos (siguiente/anterior), sin
+    # utilizar OFFSET ni COUNT(*). El orden debería estar respaldado por un
+    # índice y terminar en un campo único, Ej. ("-date", "pk").
+    cursor_pagination = False
+    cursor_ordering = ("-pk",)
+    # Nombre del parámetro GET que contiene el token del cursor.
+    cursor_kwarg = "cursor"
+    # Estrategia para obtener el total de registros en la paginación:
+    # "exact" (COUNT(*) siempre), "cached" (por empresa y filtros durante
+    # 'count_cache_timeout' segundos) o "approximate" (estadísticas de la base
+    # de datos cuando superan 'count_approximate_threshold' registros).
+    count_strategy = pagination.COUNT_EXACT
+    count_cache_timeout = 60
+    count_approximate_threshold = 10000
+    # Formulario de búsqueda cuyos campos son filtros del queryset.
+    search_form_class = None
+    # Si es True, la tabla del listado se renderiza directamente a HTML con
+    # un renderizador compilado (libs.table) y se agrega al contexto como
+    # 'table', para mostrarla en la plantilla con {{ table }}.
+    table_renderer = False
+    table_cssclass = "table"
 
     def get_search_form(self):
         if self.search_form_class:
@@ -234,27 +455,150 @@ class BaseList(BaseView):
             
         self.paginate_by = paginate_by
         qs = self.queryset_filter(super().get_queryset())
+        if self.fragment_cache_timeout is not None:
+            qs = versioning.annotate_versions(qs)
         return QuerysetCapsule(view=self, queryset=qs)
 
+    def get_count_strategy(self):
+        return self.count_strategy
+
+    def get_list_version(self):
+        """
+        Obtiene (última modificación, total) de los registros filtrados, o None
+        si el modelo no tiene campo de modificación ni historial.
+
+        El total se obtiene según 'count_strategy', por lo que con "cached" o
+        "approximate" no se recorre la tabla completa (una eliminación puede
+        tardar hasta 'count_cache_timeout' en reflejarse en la versión).
+        """
+        def aggregate():
+            queryset = original = self.get_queryset()._queryset.order_by()
+            field = versioning.get_version_field(queryset.model)
+            if field is None:
+                queryset = versioning.annotate_versions(queryset)
+                if versioning.VERSION_ANNOTATION not in queryset.query.annotations:
+                    return None
+                field = versioning.VERSION_ANNOTATION
+            if self.get_count_strategy() == pagination.COUNT_EXACT:
+                # En una sola consulta.
+                data = queryset.aggregate(last=Max(field), count=Count("pk"))
+                return (data["last"], data["count"])
+            last = queryset.aggregate(last=Max(field))["last"]
+            return (last, self.get_count(original)[0])
+        return self.memoize("list_version", aggregate)
+
+    def get_last_modified(self):
+        version = self.get_list_version()
+        return version[0] if version else None
+
+    def get_content_version(self):
+        # La cantidad de registros refleja también los eliminados.
+        version = self.get_list_version()
+        return list(version) if version else None
+
+    def get_count_cache_key(self, queryset=None):
+        """
+        Obtiene la clave de la caché para el total de (vista, empresa, filtros).
+        Si se indica el queryset, la clave incluye también su consulta, ya que 
+        get_queryset() puede estar limitado, Ej. por estado o por usuario.
+        """
+        form = getattr(self, "search_form", None)
+        data = {}
+        if form is not None and form.is_valid():
+            data = form.cleaned_data
+        view = f"{type(self).__module__}.{type(self).__qualname__}"
+        key = "unoletutils.count.{}.{}.{}.{}".format(
+            self.model._meta.label_lower, view, 
+            getattr(self.get_company(), "pk", None), 
+            pagination.get_filter_signature(data))
+        if queryset is not None:
+            key = f"{key}.{pagination.get_queryset_signature(queryset)}"
+        return key
+
+    def get_count(self, queryset):
+        """Obtiene (total, es_aproximado) según la estrategia 'count_strategy'."""
+        if isinstance(queryset, QuerysetCapsule):
+            queryset = queryset._queryset
+        strategy = self.get_count_strategy()
+        if strategy == pagination.COUNT_EXACT:
+            return queryset.count(), False
+        if strategy == pagination.COUNT_CACHED:
+            return (pagination.cached_count(queryset, 
+                self.get_count_cache_key(queryset), self.count_cache_timeout), 
+                False)
+        if strategy == pagination.COUNT_APPROXIMATE:
+            return pagination.approximate_count(queryset, 
+                self.count_approximate_threshold)
+        raise ViewError(f"La estrategia '{strategy}' no es válida. Las "
+            f"estrategias permitidas son: {pagination.COUNT_STRATEGIES}.")
+
+    def get_paginator(self, queryset, per_page, orphans=0, 
+        allow_empty_first_page=True, **kwargs):
+        return pagination.CountPaginator(queryset, per_page, orphans=orphans, 
+            allow_empty_first_page=allow_empty_first_page, 
+            count_function=self.get_count, **kwargs)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        return self.get_list_context(context)
+
+    def get_list_context(self, context):
+        """
+        Agrega al contexto del listado (con 'paginator' y 'object_list') los
+        valores propios de BaseList. Se utiliza también en AsyncListView.
+        """
+        # Permite mostrar en la plantilla "aproximadamente N resultados".
+        context["count_is_approximate"] = getattr(context.get("paginator"), 
+            "count_is_approximate", False)
+        if self.table_renderer:
+            objects = context.get("object_list")
+            if isinstance(objects, QuerysetCapsule):
+                objects = objects._queryset
+            context["table"] = table.Table(self.get_table_renderer(), 
+                objects or (), get_url=self.get_table_row_url)
+        return context
+
+    def get_table_renderer(self):
+        return table.get_table_renderer(self.model, self.get_list_display(), 
+            self.get_list_display_cssclass(), self.get_list_display_links(), 
+            self.table_cssclass)
+
+    def get_table_row_url(self, obj):
+        """Url de las columnas enlazadas (list_display_links) del objeto."""
+        return table.get_url(obj)
+
+    def get_cursor_ordering(self):
+        return self.cursor_ordering
+
+    def paginate_queryset(self, queryset, page_size):
+        """
+        Si 'cursor_pagination' es True, pagina por cursor en lugar de por
+        número de página. En ese caso no habrá un objeto 'paginator'.
+        """
+        if not self.cursor_pagination:
+            return super().paginate_queryset(queryset, page_size)
+        if isinstance(queryset, QuerysetCapsule):
+            queryset = queryset._queryset
+        try:
+            page = pagination.paginate_by_cursor(queryset, 
+                self.get_cursor_ordering(), page_size, 
+                self.request.GET.get(self.cursor_kwarg))
+        except (pagination.PaginationError) as e:
+            raise Http404(str(e))
+        page.object_list = QuerysetCapsule(view=self, queryset=page.object_list)
+        return (None, page, page.object_list, page.has_other_pages())
+
     def queryset_filter(self, queryset):
         """
-        Filtra el queryset de acuerdo al los valores del diccionario pasado.
-        Las claves del diccionario deben ser nombres de campos válidos del 
+        Filtra el queryset de acuerdo a los valores del formulario de búsqueda.
+        Los nombres de los campos del formulario deben ser filtros válidos del 
         modelo Ej. {'name': 'Unolet'} or {'name__contains': 'Uno'}
-        Las claves no válidas serán obviadas.
-        """
-        form = self.get_search_form()
-        if form.is_valid():
-            for key in form.cleaned_data:
-                value = form.cleaned_data[key]
-                print(key, value, type(value))
-                if value == "":
-                    continue
-                try:
-                    queryset = queryset.filter(**{key: value})
-                except (FieldError) as e:
-                    print(e)
-                    continue 
+        Las claves no válidas y los valores vacíos serán obviados.
+        """
+        form = self.search_form = self.get_search_form()
+        if form is not None and form.is_valid():
+            plan = filters.get_filter_plan(queryset.model, form.__class__)
+            queryset = plan.apply(queryset, form.cleaned_data)
         return queryset
 
     def get_list_display(self):
@@ -262,6 +606,9 @@ class BaseList(BaseView):
 
     def get_list_display_cssclass(self):
         return self.list_display_cssclass or {}
+
+    def get_list_display_links(self):
+        return self.list_display_links or []
     
 
 class BaseForm(BaseView):
@@ -332,32 +679,168 @@ class PrintView(TemplateView):
     pass 
 
 
+def record_print_history(obj, user):
+    """
+    Registra la impresión del objeto guardándolo y cambiando el tipo de su
+    último registro histórico a (p).
+    """
+    if bool(getattr(obj, "is_printed", False)):
+        obj._change_reason = _("Re-imprimió")
+    else:
+        obj._change_reason = _("Imprimió")
+    if user.is_staff:
+        obj._change_reason += _(" (prueba)")
+    obj.is_printed = True
+    obj.save()
+    history = obj.history.order_by("history_date").last()
+    # Los tipos predefinidos de simple-history son (+), (-) y (~), hemos 
+    # agregado uno más (p) para identificar los de la impresión.
+    history.history_type = "p" 
+    history.save()
+
+
 class DetailPrintView(DetailView):
     """Vista base para impresión heredada de DatailView."""
+    # Si es True, la plantilla de impresión se entregará renderizada en PDF.
+    pdf = False
+    # Si es True, cada impresión se registra en PrintLog (un UPDATE del campo
+    # 'is_printed' y un INSERT, requiere la migración 0001 de unoletutils). De
+    # lo contrario se guarda el objeto completo y un registro (p) en su 
+    # historial de cambios.
+    print_log = False
     
     def get_template_names(self):
         template_names = super().get_template_names()
         return [n.replace("detail.html", "print.html") for n in template_names]
 
+    def render_to_response(self, context, **response_kwargs):
+        if not self.pdf:
+            return super().render_to_response(context, **response_kwargs)
+        template_name = self.get_template_names()[0]
+        html = render_to_string(template_name, context, request=self.request)
+        return html_to_pdf_response(self.request, html, template_name)
+
     def dispatch(self, request, *args, **kwargs):
-        # Al imprimir se guarda un registro en el historial de cambios.
+        # Al imprimir se guarda un registro de la impresión.
         obj = self.get_object()
-        if hasattr(obj, "history"):
-            if bool(getattr(obj, "is_printed", False)):
-                obj._change_reason = _("Re-imprimió")
-            else:
-                obj._change_reason = _("Imprimió")
-            if request.user.is_staff:
-                obj._change_reason += _(" (prueba)")
-            obj.is_printed = True
-            obj.save()
-            history = obj.history.order_by("history_date").last()
-            # Los tipos predefinidos de simple-history son (+), (-) y (~), hemos 
-            # agregado uno más (p) para identificar los de la impresión.
-            history.history_type = "p" 
-            history.save()
+        if obj:
+            if self.print_log:
+                PrintLog.record(obj._obj, user=request.user)
+            elif hasattr(obj, "history"):
+                self.record_print_history(obj._obj)
         return super().dispatch(request, *args, **kwargs)
 
+    def record_print_history(self, obj):
+        """
+        Registra la impresión guardando el objeto y su historial de cambios
+        (si 'print_log' es False).
+        """
+        record_print_history(obj, self.request.user)
+
+
+class BatchPrintView(BaseList, generic.ListView):
+    """
+    Vista para imprimir por lotes la plantilla print.html de los objetos del 
+    listado (filtrados con el formulario de búsqueda y/o ?pk=1&pk=2...).
+
+    Los documentos se renderizan concurrentemente y se entregan unidos en un 
+    solo PDF (?format=pdf) o transmitidos en un ZIP (?format=zip). El progreso 
+    puede consultarse con el identificador del lote (la cabecera X-Batch-Id de
+    la respuesta) en la url 'unoletutils:pdf-batch', solo por el mismo usuario.
+    """
+    # Formato predeterminado ("pdf" o "zip").
+    batch_format = "pdf"
+    # Cantidad máxima de objetos por lote.
+    batch_max_objects = 500
+    # Plantilla de impresión. Por defecto '<app_label>/<model_name>_print.html'.
+    print_template_name = None
+    # Si es True, las impresiones se registran en bloque en PrintLog. De lo
+    # contrario en el historial de cada objeto, igual que DetailPrintView.
+    print_log = False
+
+    def get_print_template_name(self):
+        if self.print_template_name:
+            return self.print_template_name
+        opts = self.model._meta
+        return f"{opts.app_label}/{opts.model_name}_print.html"
+
+    def get_batch_objects(self):
+        """
+        Obtiene los objetos del lote, solo de la empresa actual (activa y a la
+        que el usuario tiene acceso), igual que DetailPrintView.
+        """
+        company = self.get_company()
+        self._check_company(company)
+        queryset = self.get_queryset()._queryset.filter(
+            **{self.company_field: company.pk})
+        pks = self.request.GET.getlist("pk")
+        if pks:
+            try:
+                pks = [int(pk) for pk in pks]
+            except (ValueError, TypeError):
+                raise Http404("Los valores de 'pk' deben ser números enteros.")
+            queryset = queryset.filter(pk__in=pks)
+        return list(queryset[:self.batch_max_objects])
+
+    def get_print_context_data(self, obj):
+        """Contexto de la plantilla de impresión de cada objeto."""
+        obj = ObjectCapsule(self, obj)
+        return {"object": obj, self.model._meta.model_name: obj, "view": self, 
+            "company": self.get_company()}
+
+    def record_prints(self, objects):
+        """Registra la impresión de los objetos, una vez renderizados."""
+        user = self.request.user
+        if self.print_log:
+            with PrintLogBuffer(user=user) as buffer:
+                for obj in objects:
+                    buffer.add(obj)
+            return
+        for obj in objects:
+            if hasattr(obj, "history"):
+                record_print_history(obj, user)
+
+    def get(self, request, *args, **kwargs):
+        objects = self.get_batch_objects()
+        if not objects:
+            raise Http404("No hay documentos para imprimir.")
+        template_name = self.get_print_template_name()
+        base_url = request.build_absolute_uri()
+        batch_id = pdf.new_batch_id()
+        owner = request.user.pk
+        total = len(objects)
+        pdf.set_batch_progress(batch_id, 0, total, owner=owner)
+
+        def on_progress(done, sent):
+            pdf.set_batch_progress(batch_id, done, total, done == total, 
+                owner=owner)
+
+        # El HTML se renderiza bajo demanda, mientras se generan los PDF.
+        documents = ((render_to_string(template_name, 
+            self.get_print_context_data(obj), request=request), base_url) 
+            for obj in objects)
+
+        if request.GET.get("format", self.batch_format) == "zip":
+            names = [
+                f"{Text.format_codename(Text.normalize(obj), '-')}-{obj.pk}.pdf" 
+                for obj in objects]
+
+            def stream():
+                yield from pdf.stream_zip(documents, names, 
+                    on_progress=on_progress)
+                # Solo si se transmitió el archivo completo.
+                self.record_prints(objects)
+
+            response = StreamingHttpResponse(stream(), 
+                content_type="application/zip")
+            response["Content-Disposition"] = 'attachment; filename="documents.zip"'
+        else:
+            response = pdf_response(pdf.render_merged(documents, 
+                on_progress=on_progress))
+            self.record_prints(objects)
+        response["X-Batch-Id"] = batch_id
+        return response
+
 
 class JsonResponseMixin:
     """
@@ -383,21 +866,152 @@ class JsonResponseMixin:
             return JsonResponse(data)
 
 
+class JsonViewMixin:
+    """
+    Responde en Json cuando el cliente lo solicita mediante la cabecera 
+    'Accept: application/json' o el parámetro '?format=json'. De lo contrario
+    la vista responde normalmente.
+    """
+    # Columnas a incluir [(nombre, etiqueta), ...]. Ver get_json_columns.
+    json_fields = None
+
+    def json_requested(self) -> bool:
+        return (self.request.GET.get("format") == "json" or 
+            not self.request.accepts("text/html"))
+
+    def get_json_columns(self):
+        return self.json_fields or [(f.name, f.verbose_name) 
+            for f in self.model._meta.concrete_fields 
+            if not f.primary_key and f.name != "tags"]
+
+    def get_row_encoder(self):
+        return json.get_row_encoder(self.model, 
+            [e[0] for e in self.get_json_columns()])
+
+    def render_to_response(self, context, **response_kwargs):
+        if self.json_requested():
+            response = self.render_to_json_response(context)
+        else:
+            response = super().render_to_response(context, **response_kwargs)
+        # La misma url puede responder Html o Json.
+        patch_vary_headers(response, ("Accept",))
+        return response
+
+
+class JsonDetailMixin(JsonViewMixin):
+    """
+    Respuesta Json para DetailView con el pk y las columnas indicadas en 
+    'json_fields' (por defecto, los campos del modelo).
+    """
+
+    def render_to_json_response(self, context):
+        obj = context["object"]
+        if isinstance(obj, ObjectCapsule):
+            obj = obj._obj
+        return JsonResponse(self.get_row_encoder().encode(obj))
+
+
+class JsonListMixin(JsonViewMixin):
+    """
+    Respuesta Json para los listados (BaseList) con el pk y las columnas de
+    'list_display' de cada registro. La respuesta se transmite por partes:
+
+        {"count": 45, "count_is_approximate": false, "next": "...", 
+        "previous": null, "columns": [...], "results": [{...}, ...]}
+
+    Con paginación por cursor 'count' es null y 'next'/'previous' contienen
+    la url de la página siguiente/anterior.
+    """
+    # Si es False se transmiten todos los registros filtrados, sin paginar.
+    json_paginate = True
+    # Registros obtenidos de la base de datos por consulta al no paginar.
+    json_chunk_size = 2000
+    # Filas por cada parte de la respuesta transmitida.
+    json_rows_per_chunk = 100
+
+    def get_paginate_by(self, queryset):
+        if not self.json_paginate and self.json_requested():
+            return None
+        return super().get_paginate_by(queryset)
+
+    def get_json_columns(self):
+        return self.json_fields or self.get_list_display()
+
+    def get_json_page_url(self, name, value) -> str:
+        params = self.request.GET.copy()
+        params[name] = value
+        return f"{self.request.path}?{params.urlencode()}"
+
+    def get_json_meta(self, context) -> dict:
+        paginator = context.get("paginator")
+        page = context.get("page_obj")
+        data = {
+            "count": paginator.count if paginator is not None else None, 
+            "count_is_approximate": context.get("count_is_approximate", False),
+            "next": None,
+            "previous": None,
+        }
+        if isinstance(page, pagination.CursorPage):
+            if page.has_next():
+                data["next"] = self.get_json_page_url(self.cursor_kwarg, 
+                    page.next_cursor)
+            if page.has_previous():
+                data["previous"] = self.get_json_page_url(self.cursor_kwarg, 
+                    page.previous_cursor)
+        elif page is not None:
+            if page.has_next():
+                data["next"] = self.get_json_page_url(self.page_kwarg, 
+                    page.next_page_number())
+            if page.has_previous():
+                data["previous"] = self.get_json_page_url(self.page_kwarg, 
+                    page.previous_page_number())
+        data["columns"] = [{"name": e[0], "label": str(e[1])} 
+            for e in self.get_json_columns()]
+        return data
+
+    def iter_json(self, context, encoder):
+        """Genera las partes de la respuesta Json del listado."""
+        meta = json.dumps(self.get_json_meta(context), separators=(",", ":"))
+        yield meta[:-1] + ',"results":['
+        objects = context["object_list"]
+        if isinstance(objects, QuerysetCapsule):
+            objects = objects._queryset
+        if isinstance(objects, QuerySet):
+            objects = objects.iterator(chunk_size=self.json_chunk_size)
+        rows = []
+        separator = ""
+        for obj in objects:
+            rows.append(encoder.dumps(obj))
+            if len(rows) >= self.json_rows_per_chunk:
+                yield separator + ",".join(rows)
+                separator = ","
+                rows = []
+        if rows:
+            yield separator + ",".join(rows)
+        yield "]}"
+
+    def render_to_json_response(self, context):
+        return StreamingHttpResponse(
+            self.iter_json(context, self.get_row_encoder()), 
+            content_type="application/json")
+
+
 @login_required
 def render_to_pdf(request, context: dict = {}, 
 template_name: str = None) -> HttpResponse:
     """
     Obtiene el nombre de una plantilla html, la renderiza en PDF y retorna 
     el objeto response con el PDF renderizado.
+
+    Si se ha configurado una cola de renderizado (libs.pdf), el PDF se genera 
+    fuera de la solicitud. Si no termina dentro del tiempo de espera, se 
+    retorna (202) el identificador del trabajo y la url para consultarlo.
     
     Parameters:
     - template_name (str): nombre de la plantilla a renderizar.
     """
     template_name = request.GET.get("template_name") or template_name
-    try:
-        HTML = weasyprintHTML
-        FontConfiguration = weasyprintFontConfiguration
-    except (NameError):
+    if not pdf.is_available():
         warnings.warn("No se puede renderizar el HTML como un PDF porque la "
             "libería externa weasyprint no está instalada.")
         return render(request, template_name, context)
@@ -405,8 +1019,140 @@ template_name: str = None) -> HttpResponse:
         html = render_to_string(template_name, context)
     except (BaseException) as e:
         raise Http404(f"Error obteniendo la plantilla: {e}")
-    response = HttpResponse(content_type="application/pdf")
+    return html_to_pdf_response(request, html, template_name)
+
+
+def html_to_pdf_response(request, html: str, 
+    template_name: str = None) -> HttpResponse:
+    """
+    Renderiza el HTML indicado en PDF y retorna el objeto response.
+
+    Si se ha configurado la caché de PDF (libs.pdf), un mismo contenido se 
+    renderiza una sola vez y las siguientes solicitudes reciben el archivo 
+    guardado.
+    """
+    base_url = request.build_absolute_uri()
+    cache = pdf.get_cache()
+    cache_key = None
+    if cache is not None:
+        cache_key = cache.get_key(html, template_name, base_url)
+        f = cache.open(cache_key)
+        if f is not None:
+            return pdf_file_response(f)
+
+    queue = pdf.get_queue()
+    if queue is None:
+        content, timings = render_pdf_content(html, base_url, cache, cache_key)
+        return pdf_timing_response(content, timings)
+    try:
+        job_id = queue.submit(html, base_url, owner=request.user.pk, 
+            cache_key=cache_key)
+    except (pdf.PDFQueueFull) as e:
+        return pdf_queue_full_response(e)
+    if queue.wait(job_id, pdf.get_deadline()):
+        return pdf_job_result_response(queue, job_id, cache, cache_key)
+    return pdf_job_status_response(queue, job_id)
+
+
+def render_pdf_content(html: str, base_url: str, cache=None, 
+    cache_key: str=None) -> tuple:
+    """
+    Renderiza el HTML en este proceso y lo guarda en la caché de PDF si se 
+    indica. Retorna (contenido, tiempos de cada etapa).
+    """
+    content = pdf.render_pdf(html, base_url)
+    if cache is not None:
+        cache.set(cache_key, content)
+    return content, pdf.get_renderer().last_timings
+
+
+def pdf_timing_response(content: bytes, timings: dict) -> HttpResponse:
+    """Igual que pdf_response() agregando los tiempos de renderizado."""
+    response = pdf_response(content)
+    # Tiempos de cada etapa visibles en las herramientas del navegador.
+    response["Server-Timing"] = ", ".join(
+        f"pdf-{stage};dur={value * 1000:.1f}" 
+        for (stage, value) in timings.items())
+    return response
+
+
+def pdf_queue_full_response(error) -> HttpResponse:
+    response = HttpResponse(str(error), status=503)
+    response["Retry-After"] = "5"
+    return response
+
+
+def pdf_job_result_response(queue, job_id: str, cache=None, 
+    cache_key: str=None) -> HttpResponse:
+    """Obtiene el PDF de un trabajo terminado y lo elimina de la cola."""
+    if queue.get_status(job_id) == pdf.FAILED:
+        error = queue.get_error(job_id)
+        queue.delete(job_id)
+        raise pdf.PDFError(error)
+    content = queue.read(job_id)
+    if cache is not None:
+        cache.set(cache_key, content)
+    queue.delete(job_id)
+    return pdf_response(content)
+
+
+def pdf_response(content: bytes) -> HttpResponse:
+    """Obtiene el objeto response con el contenido del PDF indicado."""
+    response = HttpResponse(content, content_type="application/pdf")
+    response["Content-Disposition"] = "inline; report.pdf"
+    return response
+
+
+def pdf_file_response(f) -> FileResponse:
+    """Obtiene el objeto response que transmite el archivo PDF indicado."""
+    response = FileResponse(f, content_type="application/pdf")
     response["Content-Disposition"] = "inline; report.pdf"
-    font_config = weasyprintFontConfiguration()
-    weasyprintHTML(string=html, base_url=request.build_absolute_uri()).write_pdf(response, font_config=font_config)
-    return response
\ No newline at end of file
+    return response
+
+
+def pdf_job_status_response(queue, job_id: str) -> JsonResponse:
+    """Obtiene la respuesta Json con el estado de un trabajo de renderizado."""
+    status = queue.get_status(job_id)
+    try:
+        url = reverse("unoletutils:pdf-job", kwargs={"job": job_id})
+    except (NoReverseMatch):
+        url = None
+    data = {"job": job_id, "status": status, "url": url}
+    if status == pdf.FAILED:
+        data["error"] = queue.get_error(job_id)
+        return JsonResponse(data, status=500)
+    return JsonResponse(data, status=202)
+
+
+@login_required
+def pdf_batch(request, batch: str) -> JsonResponse:
+    """Consulta el progreso de un lote de impresión (BatchPrintView)."""
+    progress = pdf.get_batch_progress(batch)
+    if progress is None or progress.get("owner") != request.user.pk:
+        raise Http404(f"No existe el lote '{batch}'.")
+    return JsonResponse({k: v for (k, v) in progress.items() if k != "owner"})
+
+
+@login_required
+def pdf_job(request, job: str) -> HttpResponse:
+    """
+    Consulta un trabajo de renderizado de PDF. Retorna el PDF si ya terminó, de
+    lo contrario su estado en Json.
+    """
+    queue = pdf.get_queue()
+    if queue is None:
+        raise Http404("No se ha configurado una cola de renderizado de PDF.")
+    try:
+        status = queue.get_status(job)
+    except (pdf.PDFError) as e:
+        raise Http404(str(e))
+    if status is None or queue.get_owner(job) != request.user.pk:
+        raise Http404(f"No existe el trabajo '{job}'.")
+    if status == pdf.DONE:
+        content = queue.read(job)
+        cache = pdf.get_cache()
+        cache_key = queue.get_info(job).get("cache_key")
+        if cache is not None and cache_key:
+            cache.set(cache_key, content)
+        return pdf_response(content)
+    return pdf_job_status_response(queue, job)